@@ -0,0 +1,175 @@
+"""
+Replay a request file against the APIs and report throughput and latency per route.
+
+Each line of the request file is one JSON request:
+
+    {"method": "POST", "path": "/api/resume/build", "json": {...}}
+
+Optional keys: "name" (report label, default "METHOD path"), "data" (form
+fields), "files" ({"field": "path/to/file.pdf"}, relative to the request
+file), "headers" and "weight" (how many times the line appears per cycle).
+Lines are replayed in order, cycling until --requests or --duration is hit.
+
+Target a running server with --url, or load an app in-process with --app;
+with LLM_PROVIDER=fake the in-process run needs no network or Groq quota.
+Run from the repository root:
+
+    LLM_PROVIDER=fake FAKE_LLM_LATENCY=lognormal:1.2:0.6 \\
+        python -m benchmarks.loadtest benchmarks/loadtest_requests.jsonl \\
+        --app unified_main:app --concurrency 16 --requests 200
+    python -m benchmarks.loadtest benchmarks/loadtest_requests.jsonl \\
+        --url http://localhost:8000 --duration 60
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+
+def load_requests(path: str) -> List[Dict[str, Any]]:
+    """Parse the request file, expanding weights and reading attached files."""
+    base = os.path.dirname(os.path.abspath(path))
+    requests = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            request = json.loads(line)
+            request.setdefault("method", "GET")
+            request.setdefault("name", f"{request['method']} {request['path']}")
+            files = {}
+            for field, file_path in (request.get("files") or {}).items():
+                with open(os.path.join(base, file_path), "rb") as attachment:
+                    files[field] = (os.path.basename(file_path), attachment.read(), "application/pdf")
+            request["files"] = files or None
+            requests.extend([request] * int(request.get("weight", 1)))
+    if not requests:
+        raise SystemExit(f"No requests in {path}")
+    return requests
+
+
+def load_app(target: str, path: str = None):
+    """Import an ASGI app given as module:attribute."""
+    if path:
+        sys.path.insert(0, os.path.abspath(path))
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def run(client: httpx.AsyncClient, requests: List[Dict[str, Any]], concurrency: int,
+              total: int, duration: float) -> Tuple[List[Tuple[str, Any, float]], float]:
+    """Replay requests with a fixed number of concurrent workers; return results and elapsed time."""
+    results: List[Tuple[str, Any, float]] = []
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    async def worker():
+        nonlocal sent
+        while (not total or sent < total) and (deadline is None or time.perf_counter() < deadline):
+            request = requests[sent % len(requests)]
+            sent += 1
+            began = time.perf_counter()
+            try:
+                response = await client.request(
+                    request["method"],
+                    request["path"],
+                    json=request.get("json"),
+                    data=request.get("data"),
+                    files=request["files"],
+                    headers=request.get("headers")
+                )
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            results.append((request["name"], status, time.perf_counter() - began))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - start
+
+
+def summarize(results: List[Tuple[str, Any, float]], elapsed: float) -> List[Dict[str, Any]]:
+    """Per-route and overall throughput, error counts and latency percentiles."""
+    by_route = defaultdict(list)
+    for name, status, latency in results:
+        by_route[name].append((status, latency))
+        by_route["TOTAL"].append((status, latency))
+
+    rows = []
+    for name, samples in by_route.items():
+        latencies = sorted(latency for _, latency in samples)
+        statuses = defaultdict(int)
+        for status, _ in samples:
+            statuses[str(status)] += 1
+        rows.append({
+            "route": name,
+            "requests": len(samples),
+            "errors": sum(1 for status, _ in samples if not isinstance(status, int) or status >= 400),
+            "statuses": dict(statuses),
+            "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+            "p50_s": percentile(latencies, 0.50),
+            "p95_s": percentile(latencies, 0.95),
+            "p99_s": percentile(latencies, 0.99),
+            "max_s": latencies[-1]
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("request_file", help="JSONL file of requests to replay")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="base URL of a running server")
+    target.add_argument("--app", help="ASGI app to load in-process, e.g. unified_main:app")
+    parser.add_argument("--path", help="directory to add to sys.path before loading --app")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=0, help="total requests (default: one pass over the file)")
+    parser.add_argument("--duration", type=float, default=0, help="stop after this many seconds instead")
+    parser.add_argument("--timeout", type=float, default=300, help="per-request timeout in seconds")
+    parser.add_argument("--output", help="also write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    requests = load_requests(args.request_file)
+    total = args.requests or (0 if args.duration else len(requests))
+
+    if args.app:
+        transport = httpx.ASGITransport(app=load_app(args.app, args.path))
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+
+    async def replay():
+        async with client:
+            return await run(client, requests, args.concurrency, total, args.duration)
+
+    results, elapsed = asyncio.run(replay())
+    rows = summarize(results, elapsed)
+
+    print(f"{len(results)} requests in {elapsed:.1f}s with concurrency {args.concurrency}")
+    print(f"{'route':<40}{'reqs':>7}{'errors':>8}{'req/s':>9}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'max s':>9}")
+    for row in sorted(rows, key=lambda r: (r["route"] == "TOTAL", r["route"])):
+        print(f"{row['route'][:39]:<40}{row['requests']:>7}{row['errors']:>8}{row['throughput_rps']:>9.2f}"
+              f"{row['p50_s']:>9.2f}{row['p95_s']:>9.2f}{row['p99_s']:>9.2f}{row['max_s']:>9.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"elapsed_s": elapsed, "concurrency": args.concurrency, "routes": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
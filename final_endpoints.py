@@ -5,12 +5,14 @@ from typing import Dict, Any, Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 # LangChain imports
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_groq import ChatGroq
+
+from shared.llm_provider import create_chat_model
 
 # Load environment variables
 load_dotenv()
@@ -35,7 +37,7 @@ class ResumeResponse(BaseModel):
 # LangChain setup
 def get_llm(model=None):
     """Get the language model based on provider."""
-    return ChatGroq(
+    return create_chat_model(
         model=model or "llama-3.3-70b-versatile",
         temperature=0.2,
         max_retries=2
@@ -155,8 +157,8 @@ async def create_resume(request: ResumeCreateRequest):
             """)
         ]
         
-        # Get response from LLM
-        response = llm.invoke(messages)
+        # Get response from LLM off the event loop; it may wait for rate-limit budget
+        response = await run_in_threadpool(llm.invoke, messages)
         
         # Extract and validate JSON
         resume_json = extract_json_from_text(response.content)
@@ -205,8 +207,8 @@ async def update_resume(request: ResumeUpdateRequest):
             """)
         ]
         
-        # Get response from LLM
-        response = llm.invoke(messages)
+        # Get response from LLM off the event loop; it may wait for rate-limit budget
+        response = await run_in_threadpool(llm.invoke, messages)
         
         # Extract and validate JSON
         updated_resume_json = extract_json_from_text(response.content)
@@ -1,7 +1,12 @@
 import logging
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 import uvicorn
 
+from shared.http_metrics import RequestMetricsMiddleware
+from shared.metrics import registry, PROMETHEUS_CONTENT_TYPE
+from shared.tracing import TracingMiddleware
+
 # Import the router
 from routers.mock_interview_routes import router as candidate_router
 from routers.resume_routers import router as resume_router
@@ -20,6 +25,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Record request latency per route and trace every request
+app.add_middleware(TracingMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include the candidate router
 app.include_router(candidate_router)
 app.include_router(resume_router)
@@ -29,6 +38,11 @@ app.include_router(resume_router)
 async def root():
     return {"status": "online", "message": "Candidate Evaluation API is running"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Expose process metrics in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # Run the application if executed directly
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -5,6 +5,8 @@ import json
 import logging
 from typing import Dict, List, Optional, Union
 from langchain_groq import ChatGroq
+
+from shared.llm_provider import LLM_PROVIDER, create_chat_model
 from langchain.prompts import PromptTemplate
 from langchain.schema.runnable import RunnablePassthrough
 
@@ -33,11 +35,11 @@ class EvaluationError(Exception):
 
 def get_llm() -> ChatGroq:
     """Initialize and return the Groq LLM with error handling."""
-    if not groq_api_key:
+    if not groq_api_key and LLM_PROVIDER == "groq":
         raise ValueError("GROQ_API_KEY environment variable not set")
     
     try:
-        return ChatGroq(
+        return create_chat_model(
             api_key=groq_api_key,
             model_name=model_name,
             temperature=0.2,  # Reduced temperature for more deterministic evaluations
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, HTTPException, status, File, UploadFile, Body
+from fastapi import APIRouter, HTTPException, status, File, UploadFile, Body, Depends, Header
 from fastapi.responses import JSONResponse
 from typing import Annotated, Dict, Optional, List, Union
+from fastapi.concurrency import run_in_threadpool
+import hashlib
 import json
+import os
 import fitz
 import logging
 import uvicorn
 
+from shared.admission import require_admission
+from shared.cache import canonical_hash
+from shared.idempotency import IdempotencyStore
+from shared.metrics import registry
+from shared.singleflight import SingleFlight
+from shared.tracing import span
+
 # Import the improved functions from our evaluation module
 from mock_interview_app.api_request import (
     prepare_prompt, 
@@ -27,7 +37,27 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-@router.post("/questions", response_description="Questions generated using LangChain with Groq")
+# Double submits and client retries of the same request share one LLM call
+questions_flight = SingleFlight("candidate_questions")
+answers_flight = SingleFlight("candidate_answers")
+# Client retries that send an Idempotency-Key get the original evaluation
+evaluation_idempotency = IdempotencyStore(os.getenv("CACHE_DB_PATH", "data/cache.sqlite3"), "complete_evaluation")
+
+pdf_extraction_latency = registry.histogram(
+    "pdf_extraction_duration_seconds",
+    "Time spent extracting text from uploaded resume PDFs.",
+)
+
+
+def extract_pdf_text(pdf_data: bytes) -> str:
+    """Return the text of every page of a PDF."""
+    with pdf_extraction_latency.time(), span("pdf.extract", bytes=len(pdf_data)) as pdf_span:
+        pdf_doc = fitz.open(stream=pdf_data, filetype="pdf")
+        if pdf_span:
+            pdf_span.set(pages=len(pdf_doc))
+        return "".join(page.get_text() for page in pdf_doc)
+
+@router.post("/questions", response_description="Questions generated using LangChain with Groq", dependencies=[Depends(require_admission())])
 async def langchain_questions(
     file: Annotated[UploadFile, File(description="A file read as UploadFile")], 
     data: str = None):
@@ -83,10 +113,7 @@ async def langchain_questions(
 
         # Extract text from PDF using PyMuPDF (fitz)
         try:
-            pdf_doc = fitz.open(stream=pdf_data, filetype="pdf")
-            resume_text = ""
-            for page in pdf_doc:
-                resume_text += page.get_text()
+            resume_text = extract_pdf_text(pdf_data)
                 
             if not resume_text.strip():
                 raise HTTPException(
@@ -110,7 +137,13 @@ async def langchain_questions(
             )
             
             logger.info(f"Generated prompt for questions, length: {len(prompt)}")
-            questions = get_questions(prompt)
+            flight_key = canonical_hash({
+                "pdf": hashlib.sha256(pdf_data).hexdigest(),
+                "params": json_data
+            })
+            questions = await questions_flight.do(
+                flight_key, lambda: run_in_threadpool(get_questions, prompt)
+            )
             
             if not questions:
                 logger.warning("No questions were generated")
@@ -146,7 +179,7 @@ async def langchain_questions(
             detail=f"An unexpected error occurred: {str(e)}"
         )
 
-@router.post("/check-answers", response_description="Checking answers using LangChain with Groq")
+@router.post("/check-answers", response_description="Checking answers using LangChain with Groq", dependencies=[Depends(require_admission())])
 async def check_answers(json_data: dict = Body(...)):
     """Evaluate candidate answers to interview questions.
     
@@ -184,7 +217,9 @@ async def check_answers(json_data: dict = Body(...)):
             logger.info(f"Generated evaluation prompt, length: {len(prompt)}")
             
             # Get evaluation result with both required parameters
-            score = get_evaluation(prompt, json_data)
+            score = await answers_flight.do(
+                canonical_hash(json_data), lambda: run_in_threadpool(get_evaluation, prompt, json_data)
+            )
             logger.info(f"Evaluation score: {score}")
             
             # Get feedback based on score
@@ -214,13 +249,14 @@ async def check_answers(json_data: dict = Body(...)):
             detail=f"An unexpected error occurred: {str(e)}"
         )
 
-@router.post("/complete-evaluation", response_description="End-to-end candidate evaluation")
+@router.post("/complete-evaluation", response_description="End-to-end candidate evaluation", dependencies=[Depends(require_admission())])
 async def complete_evaluation(
     file: Annotated[UploadFile, File(description="Candidate resume as PDF")], 
     tech_stack: str = Body(...),
     difficulty: int = Body(...),
     question_count: int = Body(...),
-    answers: Dict[str, str] = Body(...)):
+    answers: Dict[str, str] = Body(...),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
     """Perform end-to-end evaluation of a candidate.
     
     This endpoint combines resume analysis, question generation, and answer evaluation.
@@ -247,10 +283,7 @@ async def complete_evaluation(
         # Read and extract text from PDF
         pdf_data = await file.read()
         try:
-            pdf_doc = fitz.open(stream=pdf_data, filetype="pdf")
-            resume_text = ""
-            for page in pdf_doc:
-                resume_text += page.get_text()
+            resume_text = extract_pdf_text(pdf_data)
                 
             if not resume_text.strip():
                 raise HTTPException(
@@ -298,48 +331,59 @@ async def complete_evaluation(
             )
             
         # Perform the evaluation with improved error handling
-        try:
-            result = evaluate_candidate(
-                resume=resume_text,
-                tech_stack=tech_stack,
-                difficulty=difficulty,
-                question_count=question_count,
-                answers=answers
-            )
+        async def evaluate():
+            try:
+                # Off the event loop, so retries with the same key get the pending 409
+                result = await run_in_threadpool(
+                    evaluate_candidate,
+                    resume=resume_text,
+                    tech_stack=tech_stack,
+                    difficulty=difficulty,
+                    question_count=question_count,
+                    answers=answers
+                )
             
-            # Add additional debug logging
-            logger.info(f"Evaluation result status: {result.get('status', 'unknown')}")
+                # Add additional debug logging
+                logger.info(f"Evaluation result status: {result.get('status', 'unknown')}")
             
-            if result.get("status") == "error":
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=result.get("error", "Unknown evaluation error")
-                )
+                if result.get("status") == "error":
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=result.get("error", "Unknown evaluation error")
+                    )
                 
-            # Ensure score is properly formatted
-            if "score" in result:
-                try:
-                    if isinstance(result["score"], str):
-                        result["score"] = float(result["score"].strip())
-                    else:
-                        result["score"] = float(result["score"])
+                # Ensure score is properly formatted
+                if "score" in result:
+                    try:
+                        if isinstance(result["score"], str):
+                            result["score"] = float(result["score"].strip())
+                        else:
+                            result["score"] = float(result["score"])
                     
-                    # Ensure score is within valid range
-                    result["score"] = max(0, min(100, result["score"]))
-                except (ValueError, TypeError) as e:
-                    logger.error(f"Invalid score format in result: {result['score']}")
-                    result["raw_score"] = result["score"]
-                    result["score"] = 0
-                    result["score_error"] = str(e)
+                        # Ensure score is within valid range
+                        result["score"] = max(0, min(100, result["score"]))
+                    except (ValueError, TypeError) as e:
+                        logger.error(f"Invalid score format in result: {result['score']}")
+                        result["raw_score"] = result["score"]
+                        result["score"] = 0
+                        result["score_error"] = str(e)
                 
-            return result
+                return result
             
-        except Exception as e:
-            logger.error(f"Error during candidate evaluation: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Evaluation failed: {str(e)}"
-            )
+            except Exception as e:
+                logger.error(f"Error during candidate evaluation: {str(e)}")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Evaluation failed: {str(e)}"
+                )
+        
+        return await evaluation_idempotency.run(idempotency_key, {
+            "pdf": hashlib.sha256(pdf_data).hexdigest(),
+            "tech_stack": tech_stack,
+            "difficulty": difficulty,
+            "question_count": question_count,
+            "answers": answers
+        }, evaluate)
             
     except HTTPException:
         # Re-raise HTTP exceptions to preserve their status codes
@@ -2,19 +2,35 @@ import os
 import json
 import re
 from typing import Dict, Any, Optional
-from fastapi import FastAPI, HTTPException,APIRouter
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from fastapi import FastAPI, HTTPException,APIRouter, Depends, Request, Header
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 # LangChain imports
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_groq import ChatGroq
+
+from shared.admission import require_admission
+from shared.cache import SQLiteTTLCache, canonical_hash
+from shared.idempotency import IdempotencyStore
+from shared.llm_provider import create_chat_model
+from shared.responses import optimized_response
+from shared.singleflight import SingleFlight
 
 # Load environment variables
 load_dotenv()
 
+# Identical create requests (retries, double-clicks) share one result
+create_cache = SQLiteTTLCache(
+    os.getenv("CACHE_DB_PATH", "data/cache.sqlite3"),
+    "resume_create",
+    ttl_seconds=int(os.getenv("RESULT_CACHE_TTL_SECONDS", "600")),
+    max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+)
+create_flight = SingleFlight("resume_create")
+# Client retries that send an Idempotency-Key get the original response
+create_idempotency = IdempotencyStore(os.getenv("CACHE_DB_PATH", "data/cache.sqlite3"), "resume_create")
+
 router = APIRouter(
     prefix="/resume",
     tags=["resume"],
@@ -25,6 +41,7 @@ class ResumeCreateRequest(BaseModel):
     user_profile: Dict[str, Any]
     resume_template: Dict[str, Any]
     job_description: str
+    regenerate: bool = False
 
 class ResumeUpdateRequest(BaseModel):
     previous_resume: Dict[str, Any]
@@ -38,7 +55,7 @@ class ResumeResponse(BaseModel):
 # LangChain setup
 def get_llm(model=None):
     """Get the language model based on provider."""
-    return ChatGroq(
+    return create_chat_model(
         model=model or "llama-3.3-70b-versatile",
         temperature=0.2,
         max_retries=2
@@ -127,55 +144,85 @@ def validate_json_structure(json_data: Dict[str, Any], template: Dict[str, Any])
             
     return result
 
+def generate_resume(request: ResumeCreateRequest) -> Dict[str, Any]:
+    """Run the LLM and return the resume validated against the template."""
+    llm = get_llm()
+    
+    # Convert request data to strings for the prompt
+    job_description = request.job_description
+    user_profile_str = json.dumps(request.user_profile, indent=2)
+    template_str = json.dumps(request.resume_template, indent=2)
+    
+    # Create messages for the LLM
+    messages = [
+        SystemMessage(content=SYSTEM_PROMPT),
+        HumanMessage(content=f"""
+        I need to create a resume for a job application. Here are the details:
+        
+        JOB DESCRIPTION:
+        {job_description}
+        
+        MY PROFILE:
+        {user_profile_str}
+        
+        RESUME TEMPLATE:
+        {template_str}
+        
+        Please create a tailored resume that follows the exact structure of the template and highlights my relevant skills and experiences for this job. Return the result as a valid JSON object.
+        """)
+    ]
+    
+    # Get response from LLM
+    response = llm.invoke(messages)
+    
+    # Extract and validate JSON
+    resume_json = extract_json_from_text(response.content)
+    if not resume_json:
+        raise HTTPException(status_code=500, detail="Failed to generate valid resume JSON")
+    
+    # Validate against template
+    return validate_json_structure(resume_json, request.resume_template)
+
 # API endpoints
-@router.post("/create", response_model=ResumeResponse)
-async def create_resume(request: ResumeCreateRequest):
+@router.post("/create", response_model=ResumeResponse, dependencies=[Depends(require_admission())])
+async def create_resume(
+    request: ResumeCreateRequest,
+    http_request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """Create a new resume based on user profile, job description, and template."""
     try:
-        llm = get_llm()
-        
-        # Convert request data to strings for the prompt
-        job_description = request.job_description
-        user_profile_str = json.dumps(request.user_profile, indent=2)
-        template_str = json.dumps(request.resume_template, indent=2)
+        cache_key = canonical_hash({
+            "job_description": request.job_description.strip(),
+            "user_profile": request.user_profile,
+            "resume_template": request.resume_template
+        })
         
-        # Create messages for the LLM
-        messages = [
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=f"""
-            I need to create a resume for a job application. Here are the details:
+        async def create():
+            validated_resume = None if request.regenerate else create_cache.get(cache_key)
             
-            JOB DESCRIPTION:
-            {job_description}
-            
-            MY PROFILE:
-            {user_profile_str}
+            if validated_resume is None:
+                async def run_create():
+                    result = await run_in_threadpool(generate_resume, request)
+                    create_cache.set(cache_key, result)
+                    return result
+                
+                # Concurrent identical requests wait for the same LLM call
+                flight_key = f"{cache_key}:regenerate" if request.regenerate else cache_key
+                validated_resume = await create_flight.do(flight_key, run_create)
             
-            RESUME TEMPLATE:
-            {template_str}
-            
-            Please create a tailored resume that follows the exact structure of the template and highlights my relevant skills and experiences for this job. Return the result as a valid JSON object.
-            """)
-        ]
-        
-        # Get response from LLM
-        response = llm.invoke(messages)
-        
-        # Extract and validate JSON
-        resume_json = extract_json_from_text(response.content)
-        if not resume_json:
-            raise HTTPException(status_code=500, detail="Failed to generate valid resume JSON")
-        
-        # Validate against template
-        validated_resume = validate_json_structure(resume_json, request.resume_template)
+            return {"resume": validated_resume}
         
-        return JSONResponse(content=jsonable_encoder({"resume": validated_resume}))
+        response = await create_idempotency.run(idempotency_key, request.model_dump(), create)
+        return optimized_response(http_request, response)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating resume: {str(e)}")
 
-@router.post("/update", response_model=ResumeResponse)
-async def update_resume(request: ResumeUpdateRequest):
+@router.post("/update", response_model=ResumeResponse, dependencies=[Depends(require_admission())])
+async def update_resume(request: ResumeUpdateRequest, http_request: Request):
     """Update an existing resume based on job description and user query."""
     try:
         llm = get_llm()
@@ -208,8 +255,8 @@ async def update_resume(request: ResumeUpdateRequest):
             """)
         ]
         
-        # Get response from LLM
-        response = llm.invoke(messages)
+        # Get response from LLM off the event loop; it may wait for rate-limit budget
+        response = await run_in_threadpool(llm.invoke, messages)
         
         # Extract and validate JSON
         updated_resume_json = extract_json_from_text(response.content)
@@ -219,7 +266,7 @@ async def update_resume(request: ResumeUpdateRequest):
         # Validate against template
         validated_resume = validate_json_structure(updated_resume_json, request.resume_template)
         
-        return JSONResponse(content=jsonable_encoder({"resume": validated_resume}))
+        return optimized_response(http_request, {"resume": validated_resume})
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating resume: {str(e)}")
@@ -1,6 +1,8 @@
 import os
+import sys
 import json
 import re
+import threading
 from typing import TypedDict, Annotated, List, Dict, Any
 import operator
 from dotenv import load_dotenv
@@ -9,7 +11,13 @@ from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
 # from langchain_openai import ChatOpenAI
-from langchain_groq import ChatGroq
+
+# Make the repository-level `shared` package importable
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from shared.llm_provider import create_chat_model
 
 
 from langgraph.graph import StateGraph, START, END
@@ -72,7 +80,7 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
 def get_llm(provider="groq", model=None):
     """Get the language model based on provider."""
     if provider == "groq":
-        return ChatGroq(
+        return create_chat_model(
             model = model or "llama-3.3-70b-versatile",
             temperature=0.2,
             max_retries = 2
@@ -105,7 +113,7 @@ def get_llm(provider="groq", model=None):
             
         # If all attempts fail, try using a different provider
         print(f"Could not initialize Llama model. Falling back to Groq.")
-        return ChatGroq(
+        return create_chat_model(
             model="llama-3.3-70b-versatile",
             temperature=0.2,
             max_retries=2
@@ -134,7 +142,7 @@ def analyze_job(state: ResumeBuilderState) -> Dict:
     response = llm.invoke(messages)
     
     return {
-        "messages": state["messages"] + [messages[1], response]
+        "messages": [messages[1], response]
     }
 
 def review_profile(state: ResumeBuilderState) -> Dict:
@@ -160,7 +168,7 @@ def review_profile(state: ResumeBuilderState) -> Dict:
     response = llm.invoke(messages)
     
     return {
-        "messages": state["messages"] + [messages[-1], response]
+        "messages": [messages[-1], response]
     }
 
 def generate_resume(state: ResumeBuilderState) -> Dict:
@@ -203,17 +211,17 @@ def generate_resume(state: ResumeBuilderState) -> Dict:
         
         if not resume_json:
             return {
-                "messages": state["messages"] + [messages[-1], response],
+                "messages": [messages[-1], response],
                 "error": "Failed to extract valid JSON from the response."
             }
         
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
             "resume_json": resume_json
         }
     except Exception as e:
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
             "error": f"Error processing resume: {str(e)}"
         }
 
@@ -250,18 +258,18 @@ def handle_error(state: ResumeBuilderState) -> Dict:
         
         if not resume_json:
             return {
-                "messages": state["messages"] + [messages[-1], response],
+                "messages": [messages[-1], response],
                 "error": "Still unable to extract valid JSON. Please check the template format."
             }
         
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
             "resume_json": resume_json,
             "error": ""  # Clear the error
         }
     except Exception as e:
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
             "error": f"Error processing resume: {str(e)}"
         }
 def check_error_condition(state: ResumeBuilderState) -> str:
@@ -310,6 +318,18 @@ def build_resume_builder_agent():
     # Compile the graph
     return graph_builder.compile()
 
+_resume_agent = None
+_resume_agent_lock = threading.Lock()
+
+def get_resume_builder_agent():
+    """Return the compiled resume builder agent, compiling it once per process."""
+    global _resume_agent
+    if _resume_agent is None:
+        with _resume_agent_lock:
+            if _resume_agent is None:
+                _resume_agent = build_resume_builder_agent()
+    return _resume_agent
+
 def build_resume(job_description: str, user_profile: Dict[str, Any], resume_template: Dict[str, Any]) -> Dict[str, Any]:
     """
     Build a resume using the AI agent.
@@ -322,8 +342,8 @@ def build_resume(job_description: str, user_profile: Dict[str, Any], resume_temp
     Returns:
         dict: The generated resume in JSON format
     """
-    # Initialize the agent
-    resume_agent = build_resume_builder_agent()
+    # Reuse the compiled agent
+    resume_agent = get_resume_builder_agent()
     
     # Initialize the state
     initial_state = {
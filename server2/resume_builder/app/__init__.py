@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Make the repository-level `shared` package importable when the app is run
+# from server2/resume_builder (e.g. via run.py or uvicorn app.main:app)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from typing import Dict, Any
+
+from app.graphs.registry import graph_registry
+from app.services.routing import model_router
+
+router = APIRouter()
+
+@router.get("/stats", response_model=Dict[str, Dict[str, Any]])
+async def get_graph_stats():
+    """Get compile time and invocation statistics for each graph variant."""
+    return graph_registry.stats()
+
+@router.get("/models", response_model=Dict[str, Dict[str, Any]])
+async def get_model_health():
+    """Get rolling latency, error rate and circuit state for each routed model."""
+    return model_router.stats()
@@ -1,17 +1,29 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Dict, Any, Optional, Literal
 
+from shared.responses import optimized_response
+
+from app.core.models import HistoryPage
 from app.services.memory import MemoryService
 
 router = APIRouter()
 memory_service = MemoryService()
 
-@router.get("/{user_id}", response_model=List[Dict[str, Any]])
-async def get_user_memories(user_id: str):
-    """Get all memories for a user."""
+@router.get("/{user_id}", response_model=HistoryPage)
+async def get_user_memories(
+    request: Request,
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    order: Literal["desc", "asc"] = "desc",
+    view: Literal["metadata", "full"] = "metadata"
+):
+    """Get a page of memories for a user, newest first by default."""
     try:
-        memories = memory_service.get_previous_resumes(user_id)
-        return memories
+        page = memory_service.list_resumes(user_id, limit=limit, cursor=cursor, order=order, view=view)
+        return optimized_response(request, page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving memories: {str(e)}")
 
@@ -19,8 +31,10 @@ async def get_user_memories(user_id: str):
 async def delete_memory(user_id: str, memory_id: str):
     """Delete a specific memory."""
     try:
-        # This would need to be implemented in the MemoryService
-        # memory_service.delete_memory(user_id, memory_id)
+        if not memory_service.delete_memory(user_id, memory_id):
+            raise HTTPException(status_code=404, detail="Memory not found")
         return {"status": "Memory deleted"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting memory: {str(e)}")
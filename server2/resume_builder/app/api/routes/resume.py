@@ -1,20 +1,41 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, List, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Header
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, List, Any, Optional, Literal
+import uuid
 
+from shared.admission import require_admission
+from shared.cache import SQLiteTTLCache, canonical_hash
+from shared.idempotency import IdempotencyStore
+from shared.responses import optimized_response
+from shared.singleflight import SingleFlight
+
+from app.core.config import settings
 from app.core.models import (
     ResumeRequest, 
     ResumeResponse, 
     ResumeUpdateRequest, 
     ChatRequest, 
-    ChatResponse
+    ChatResponse,
+    HistoryPage
 )
-from app.services.resume import ResumeService
+from app.services.resume import ResumeService, ResumeBuildError, BuildConflictError
 from app.services.memory import MemoryService
 
 router = APIRouter()
 resume_service = ResumeService()
 memory_service = MemoryService()
 
+# Identical build requests (retries, double-clicks) share one result
+build_cache = SQLiteTTLCache(
+    settings.CACHE_DB_PATH,
+    "resume_build",
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES
+)
+build_flight = SingleFlight("resume_build")
+# Client retries that send an Idempotency-Key get the original response
+build_idempotency = IdempotencyStore(settings.CACHE_DB_PATH, "resume_build")
+
 # Define this function at the top since it's used in other functions
 def get_default_template():
     """Return the default resume template."""
@@ -60,8 +81,12 @@ def get_default_template():
         ]
     }
 
-@router.post("/build", response_model=ResumeResponse)
-async def build_resume(request: ResumeRequest):
+@router.post("/build", response_model=ResumeResponse, dependencies=[Depends(require_admission())])
+async def build_resume(
+    request: ResumeRequest,
+    http_request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """Build a tailored resume based on job description and user profile."""
     try:
         # Handle Pydantic model conversion safely
@@ -72,22 +97,92 @@ async def build_resume(request: ResumeRequest):
         else:
             resume_template = get_default_template()
             
-        resume_json, memory_id, user_id = resume_service.build_resume(
-            request.job_description,
-            user_profile,
-            resume_template,
-            request.user_id
+        cache_key = canonical_hash({
+            "job_description": request.job_description.strip(),
+            "user_profile": user_profile,
+            "resume_template": resume_template,
+            "user_id": request.user_id,
+            "mode": request.mode
+        })
+        
+        async def run_build():
+            build_id = request.build_id or str(uuid.uuid4())
+            resume_json, memory_id, user_id = await run_in_threadpool(
+                resume_service.build_resume,
+                request.job_description,
+                user_profile,
+                resume_template,
+                request.user_id,
+                build_id,
+                request.mode,
+                # Regenerating asks for a fresh build rather than an edit of a past resume
+                not request.regenerate
+            )
+            
+            response = {
+                "resume": resume_json,
+                "memory_id": memory_id,
+                "user_id": user_id,
+                "build_id": build_id
+            }
+            if request.user_id is not None:
+                build_cache.set(cache_key, response)
+            return response
+        
+        async def build():
+            # Anonymous builds mint a new user_id each time; sharing the result
+            # would hand one caller's user_id and memory_id to another
+            if request.user_id is None:
+                return await run_build()
+            
+            if not request.regenerate:
+                cached_response = build_cache.get(cache_key)
+                if cached_response is not None:
+                    return cached_response
+            
+            # Concurrent identical requests wait for the same build
+            flight_key = f"{cache_key}:regenerate" if request.regenerate else cache_key
+            return await build_flight.do(flight_key, run_build)
+        
+        response = await build_idempotency.run(idempotency_key, request.model_dump(), build)
+        return optimized_response(http_request, response)
+    except HTTPException:
+        raise
+    except BuildConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ResumeBuildError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error building resume (resume with build_id {e.build_id} and user_id {e.user_id}): {str(e)}",
+            headers={"X-Build-Id": e.build_id, "X-User-Id": e.user_id}
         )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building resume: {str(e)}")
+
+@router.post("/build/{build_id}/resume", response_model=ResumeResponse, dependencies=[Depends(require_admission())])
+async def resume_build(build_id: str, http_request: Request, user_id: str = Query(...)):
+    """Resume one of the user's failed builds from its last completed step."""
+    try:
+        resume_json, memory_id, user_id = await run_in_threadpool(resume_service.resume_build, build_id, user_id)
         
-        return {
+        return optimized_response(http_request, {
             "resume": resume_json,
             "memory_id": memory_id,
-            "user_id": user_id
-        }
+            "user_id": user_id,
+            "build_id": build_id
+        })
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Build not found or nothing left to resume")
+    except ResumeBuildError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error resuming build {e.build_id}: {str(e)}",
+            headers={"X-Build-Id": e.build_id, "X-User-Id": e.user_id}
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error building resume: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error resuming build: {str(e)}")
 
-@router.post("/update", response_model=ResumeResponse)
+@router.post("/update", response_model=ResumeResponse, dependencies=[Depends(require_admission())])
 async def update_resume(request: ResumeUpdateRequest):
     """Update an existing resume based on user instructions."""
     try:
@@ -97,7 +192,8 @@ async def update_resume(request: ResumeUpdateRequest):
             raise HTTPException(status_code=404, detail="Resume not found")
         
         # Update the resume
-        updated_resume, memory_id = resume_service.update_resume(
+        updated_resume, memory_id = await run_in_threadpool(
+            resume_service.update_resume,
             request.user_id,
             resume_data["resume"],
             get_default_template(),  # Using default template for validation
@@ -114,27 +210,38 @@ async def update_resume(request: ResumeUpdateRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating resume: {str(e)}")
 
-@router.get("/history/{user_id}", response_model=List[Dict[str, Any]])
-async def get_resume_history(user_id: str):
-    """Get all previous resumes for a user."""
+@router.get("/history/{user_id}", response_model=HistoryPage)
+async def get_resume_history(
+    request: Request,
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    order: Literal["desc", "asc"] = "desc",
+    view: Literal["metadata", "full"] = "metadata"
+):
+    """Get a page of previous resumes for a user, newest first by default."""
     try:
-        resumes = memory_service.get_previous_resumes(user_id)
-        return resumes
+        page = memory_service.list_resumes(user_id, limit=limit, cursor=cursor, order=order, view=view)
+        return optimized_response(request, page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving resume history: {str(e)}")
 
 @router.get("/{user_id}/{memory_id}")
-async def get_resume(user_id: str, memory_id: str):
+async def get_resume(request: Request, user_id: str, memory_id: str):
     """Get a specific resume by ID."""
     try:
         resume_data = memory_service.get_resume_by_id(user_id, memory_id)
         if not resume_data:
             raise HTTPException(status_code=404, detail="Resume not found")
-        return resume_data
+        return optimized_response(request, resume_data)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving resume: {str(e)}")
 
-@router.post("/chat", response_model=ChatResponse)
+@router.post("/chat", response_model=ChatResponse, dependencies=[Depends(require_admission())])
 async def chat_with_resume(request: ChatRequest):
     """Chat with the AI to update a resume."""
     try:
@@ -153,7 +260,8 @@ async def chat_with_resume(request: ChatRequest):
             )
         
         # Update the resume
-        updated_resume, memory_id = resume_service.update_resume(
+        updated_resume, memory_id = await run_in_threadpool(
+            resume_service.update_resume,
             request.user_id,
             resume_json,
             get_default_template(),  # Using default template for validation
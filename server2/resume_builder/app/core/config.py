@@ -14,6 +14,51 @@ class Settings(BaseSettings):
     DEFAULT_MODEL: str = os.getenv("DEFAULT_MODEL", "llama-3.3-70b-versatile")
     FALLBACK_MODEL: str = os.getenv("FALLBACK_MODEL", "llama-3.1-8b-instant")
     
+    # Model Routing Settings
+    ROUTER_LATENCY_SLO_SECONDS: float = float(os.getenv("ROUTER_LATENCY_SLO_SECONDS", "20"))
+    ROUTER_ERROR_RATE_THRESHOLD: float = float(os.getenv("ROUTER_ERROR_RATE_THRESHOLD", "0.5"))
+    ROUTER_FAILURE_THRESHOLD: int = int(os.getenv("ROUTER_FAILURE_THRESHOLD", "3"))
+    ROUTER_COOLDOWN_SECONDS: float = float(os.getenv("ROUTER_COOLDOWN_SECONDS", "30"))
+    ROUTER_WINDOW_SIZE: int = int(os.getenv("ROUTER_WINDOW_SIZE", "50"))
+    ROUTER_MIN_SAMPLES: int = int(os.getenv("ROUTER_MIN_SAMPLES", "5"))
+    ROUTER_LARGE_PROMPT_TOKENS: int = int(os.getenv("ROUTER_LARGE_PROMPT_TOKENS", "6000"))
+    
+    # Graph Settings
+    PARALLEL_SECTIONS: bool = os.getenv("PARALLEL_SECTIONS", "false").lower() == "true"
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+    CONTEXT_SUMMARY_TOKENS: int = int(os.getenv("CONTEXT_SUMMARY_TOKENS", "800"))
+    DEFAULT_BUILD_MODE: str = os.getenv("DEFAULT_BUILD_MODE", "thorough")
+    FAST_MODE_MAX_TOKENS: int = int(os.getenv("FAST_MODE_MAX_TOKENS", "1500"))
+    MAX_RESUME_RETRIES: int = int(os.getenv("MAX_RESUME_RETRIES", "2"))
+    RETRY_BACKOFF_SECONDS: float = float(os.getenv("RETRY_BACKOFF_SECONDS", "1.0"))
+    REPAIR_CONTEXT_CHARS: int = int(os.getenv("REPAIR_CONTEXT_CHARS", "4000"))
+    
+    # Cache Settings
+    CACHE_DB_PATH: str = os.getenv("CACHE_DB_PATH", "data/cache.sqlite3")
+    ANALYSIS_CACHE_TTL_SECONDS: int = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "86400"))
+    ANALYSIS_CACHE_MAX_ENTRIES: int = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+    RESULT_CACHE_TTL_SECONDS: int = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+    
+    # Checkpoint Settings
+    CHECKPOINT_DB_PATH: str = os.getenv("CHECKPOINT_DB_PATH", "data/checkpoints.sqlite3")
+    CHECKPOINT_TTL_SECONDS: int = int(os.getenv("CHECKPOINT_TTL_SECONDS", "86400"))
+    CHECKPOINT_CLEANUP_INTERVAL_SECONDS: int = int(os.getenv("CHECKPOINT_CLEANUP_INTERVAL_SECONDS", "3600"))
+    
+    # Memory Settings
+    MEMORY_BACKEND: str = os.getenv("MEMORY_BACKEND", "sqlite")
+    MEMORY_DB_PATH: str = os.getenv("MEMORY_DB_PATH", "data/memory.sqlite3")
+    MEMORY_CACHE_SIZE: int = int(os.getenv("MEMORY_CACHE_SIZE", "256"))
+    MEMORY_CACHE_SYNC_SECONDS: float = float(os.getenv("MEMORY_CACHE_SYNC_SECONDS", "1.0"))
+    MEMORY_MAX_VERSIONS_PER_USER: int = int(os.getenv("MEMORY_MAX_VERSIONS_PER_USER", "100"))
+    MEMORY_TTL_SECONDS: int = int(os.getenv("MEMORY_TTL_SECONDS", "7776000"))
+    MEMORY_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("MEMORY_SWEEP_INTERVAL_SECONDS", "3600"))
+
+    # Reuse Settings
+    RESUME_INDEX_DIR: str = os.getenv("RESUME_INDEX_DIR", "data/resume_index")
+    RESUME_INDEX_DIMENSIONS: int = int(os.getenv("RESUME_INDEX_DIMENSIONS", "4096"))
+    REUSE_SIMILARITY_THRESHOLD: float = float(os.getenv("REUSE_SIMILARITY_THRESHOLD", "0.85"))
+
     # CORS Settings
     BACKEND_CORS_ORIGINS: list = ["*"]
 
@@ -1,4 +1,5 @@
-from typing import Dict, List, Any, Optional
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Literal
 from pydantic import BaseModel, Field
 
 
@@ -26,6 +27,9 @@ class ResumeRequest(BaseModel):
     user_profile: UserProfile
     resume_template: Optional[ResumeTemplate] = None
     user_id: Optional[str] = None
+    build_id: Optional[str] = None
+    mode: Optional[Literal["fast", "thorough", "auto"]] = None
+    regenerate: bool = False
 
 
 class ResumeUpdateRequest(BaseModel):
@@ -38,6 +42,7 @@ class ResumeResponse(BaseModel):
     resume: Dict[str, Any]
     memory_id: str
     user_id: str
+    build_id: Optional[str] = None
 
 
 class ChatMessage(BaseModel):
@@ -55,3 +60,14 @@ class ChatResponse(BaseModel):
     message: str
     updated_resume: Optional[Dict[str, Any]] = None
     memory_id: Optional[str] = None
+
+
+class HistoryItem(BaseModel):
+    memory_id: str
+    data: Dict[str, Any]
+    created_at: datetime
+
+
+class HistoryPage(BaseModel):
+    items: List[HistoryItem]
+    next_cursor: Optional[str] = None
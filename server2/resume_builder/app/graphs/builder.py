@@ -4,15 +4,28 @@ from langchain_core.messages import BaseMessage
 from langgraph.graph import StateGraph, END
 
 from app.graphs.nodes import (
+    lookup_job_analysis,
     analyze_job, 
     review_profile, 
     generate_resume, 
+    generate_resume_fast,
+    generate_section,
+    merge_resume_sections,
+    repair_resume,
     handle_error, 
     conversational_resume_editor,
+    route_resume_sections,
+    check_analysis_cache,
+    check_repair_outcome,
     check_error_condition
 )
 
 
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer that merges section results written by parallel nodes."""
+    return {**(left or {}), **(right or {})}
+
+
 class ResumeBuilderState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
     job_description: str
@@ -21,30 +34,44 @@ class ResumeBuilderState(TypedDict):
     resume_json: Dict[str, Any]
     error: str
     user_instruction: str
+    resume_sections: Annotated[Dict[str, Any], merge_dicts]
+    analysis_cached: bool
+    raw_output: str
+    retry_count: int
 
 
-def build_resume_builder_graph():
+def build_resume_builder_graph(checkpointer=None):
     """Build and return the resume builder agent with conversational editing."""
     # Create the graph builder
     graph_builder = StateGraph(ResumeBuilderState)
     
     # Add nodes
+    graph_builder.add_node("lookup_job_analysis", lookup_job_analysis)
     graph_builder.add_node("analyze_job", analyze_job)
     graph_builder.add_node("review_profile", review_profile)
     graph_builder.add_node("generate_resume", generate_resume)
+    graph_builder.add_node("repair_resume", repair_resume)
     graph_builder.add_node("handle_error", handle_error)
     graph_builder.add_node("conversational_update", conversational_resume_editor)
     
-    # Add edges
+    # Add edges; a cached job analysis skips straight to the profile review
+    graph_builder.add_conditional_edges(
+        "lookup_job_analysis",
+        check_analysis_cache,
+        {
+            "analyze_job": "analyze_job",
+            "review_profile": "review_profile"
+        }
+    )
     graph_builder.add_edge("analyze_job", "review_profile")
     graph_builder.add_edge("review_profile", "generate_resume")
     
-    # Add conditional edges for error handling
+    # Add conditional edges for error handling; errors go to local repair first
     graph_builder.add_conditional_edges(
         "generate_resume",
         check_error_condition,
         {
-            "handle_error": "handle_error",
+            "handle_error": "repair_resume",
             "end": END
         }
     )
@@ -52,6 +79,16 @@ def build_resume_builder_graph():
     graph_builder.add_conditional_edges(
         "handle_error",
         check_error_condition,
+        {
+            "handle_error": "repair_resume",
+            "end": END
+        }
+    )
+    
+    # Local repair first; re-ask the model only while the retry budget lasts
+    graph_builder.add_conditional_edges(
+        "repair_resume",
+        check_repair_outcome,
         {
             "handle_error": "handle_error",
             "end": END
@@ -62,6 +99,122 @@ def build_resume_builder_graph():
     graph_builder.add_conditional_edges(
         "conversational_update",
         check_error_condition,
+        {
+            "handle_error": "repair_resume",
+            "end": END
+        }
+    )
+    
+    # Set the entry point
+    graph_builder.set_entry_point("lookup_job_analysis")
+    
+    # Compile the graph
+    return graph_builder.compile(checkpointer=checkpointer)
+
+
+def build_parallel_resume_builder_graph(checkpointer=None):
+    """Build and return the resume builder agent that generates template sections in parallel."""
+    # Create the graph builder
+    graph_builder = StateGraph(ResumeBuilderState)
+    
+    # Add nodes
+    graph_builder.add_node("lookup_job_analysis", lookup_job_analysis)
+    graph_builder.add_node("analyze_job", analyze_job)
+    graph_builder.add_node("review_profile", review_profile)
+    graph_builder.add_node("generate_section", generate_section)
+    graph_builder.add_node("merge_sections", merge_resume_sections)
+    graph_builder.add_node("repair_resume", repair_resume)
+    graph_builder.add_node("handle_error", handle_error)
+    
+    # Add edges; a cached job analysis skips straight to the profile review
+    graph_builder.add_conditional_edges(
+        "lookup_job_analysis",
+        check_analysis_cache,
+        {
+            "analyze_job": "analyze_job",
+            "review_profile": "review_profile"
+        }
+    )
+    graph_builder.add_edge("analyze_job", "review_profile")
+    
+    # Fan out one generate_section task per template section; all of them
+    # run in the same step and are joined by merge_sections
+    graph_builder.add_conditional_edges(
+        "review_profile",
+        route_resume_sections,
+        ["generate_section"]
+    )
+    graph_builder.add_edge("generate_section", "merge_sections")
+    
+    # Add conditional edges for error handling; errors go to local repair first
+    graph_builder.add_conditional_edges(
+        "merge_sections",
+        check_error_condition,
+        {
+            "handle_error": "repair_resume",
+            "end": END
+        }
+    )
+    
+    graph_builder.add_conditional_edges(
+        "handle_error",
+        check_error_condition,
+        {
+            "handle_error": "repair_resume",
+            "end": END
+        }
+    )
+    
+    # Local repair first; re-ask the model only while the retry budget lasts
+    graph_builder.add_conditional_edges(
+        "repair_resume",
+        check_repair_outcome,
+        {
+            "handle_error": "handle_error",
+            "end": END
+        }
+    )
+    
+    # Set the entry point
+    graph_builder.set_entry_point("lookup_job_analysis")
+    
+    # Compile the graph
+    return graph_builder.compile(checkpointer=checkpointer)
+
+
+def build_fast_resume_builder_graph(checkpointer=None):
+    """Build and return the resume builder agent that generates the resume in a single call."""
+    # Create the graph builder
+    graph_builder = StateGraph(ResumeBuilderState)
+    
+    # Add nodes
+    graph_builder.add_node("generate_resume_fast", generate_resume_fast)
+    graph_builder.add_node("repair_resume", repair_resume)
+    graph_builder.add_node("handle_error", handle_error)
+    
+    # Add conditional edges for error handling; errors go to local repair first
+    graph_builder.add_conditional_edges(
+        "generate_resume_fast",
+        check_error_condition,
+        {
+            "handle_error": "repair_resume",
+            "end": END
+        }
+    )
+    
+    graph_builder.add_conditional_edges(
+        "handle_error",
+        check_error_condition,
+        {
+            "handle_error": "repair_resume",
+            "end": END
+        }
+    )
+    
+    # Local repair first; re-ask the model only while the retry budget lasts
+    graph_builder.add_conditional_edges(
+        "repair_resume",
+        check_repair_outcome,
         {
             "handle_error": "handle_error",
             "end": END
@@ -69,7 +222,25 @@ def build_resume_builder_graph():
     )
     
     # Set the entry point
-    graph_builder.set_entry_point("analyze_job")
+    graph_builder.set_entry_point("generate_resume_fast")
+    
+    # Compile the graph
+    return graph_builder.compile(checkpointer=checkpointer)
+
+
+def build_resume_editor_graph(checkpointer=None):
+    """Build and return the conversational-edit-only resume agent."""
+    # Create the graph builder
+    graph_builder = StateGraph(ResumeBuilderState)
+    
+    # Add nodes
+    graph_builder.add_node("conversational_update", conversational_resume_editor)
+    
+    # Edits report errors back to the caller instead of regenerating the resume
+    graph_builder.add_edge("conversational_update", END)
+    
+    # Set the entry point
+    graph_builder.set_entry_point("conversational_update")
     
     # Compile the graph
-    return graph_builder.compile()
+    return graph_builder.compile(checkpointer=checkpointer)
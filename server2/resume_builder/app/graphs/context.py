@@ -0,0 +1,95 @@
+import logging
+from typing import Dict, List, Sequence
+
+from langchain_core.messages import BaseMessage, SystemMessage
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Number of most recent messages each node keeps verbatim; everything older is
+# folded into a single summary message. The analysis and profile review are the
+# last two AI turns before generation, so generation nodes only need those plus
+# their own prompt.
+NODE_CONTEXT_POLICY: Dict[str, int] = {
+    "review_profile": 2,
+    "generate_resume": 4,
+    "generate_section": 4,
+    "conversational_update": 2,
+}
+
+SUMMARY_PREFIX = "Summary of earlier conversation:"
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Roughly estimate the tokens in a piece of text (~4 characters per token)."""
+    return len(text) // 4
+
+
+def estimate_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Roughly estimate prompt tokens, adding a small per-message overhead."""
+    return sum(estimate_text_tokens(str(message.content)) + 4 for message in messages)
+
+
+def deduplicate_messages(messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """Drop repeated messages, keeping the first occurrence of each (type, content) pair."""
+    seen = set()
+    unique = []
+    for message in messages:
+        key = (message.type, str(message.content))
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(message)
+    return unique
+
+
+def summarize_messages(messages: Sequence[BaseMessage], token_budget: int) -> SystemMessage:
+    """Fold older turns into one compact message that fits in token_budget."""
+    char_budget = max(token_budget * 4, 0)
+    per_message = max(char_budget // max(len(messages), 1), 80)
+
+    lines = []
+    for message in messages:
+        content = " ".join(str(message.content).split())
+        if len(content) > per_message:
+            content = content[:per_message].rstrip() + "..."
+        lines.append(f"- {message.type}: {content}")
+
+    summary = "\n".join(lines)[:char_budget]
+    return SystemMessage(content=f"{SUMMARY_PREFIX}\n{summary}")
+
+
+def window_messages(messages: Sequence[BaseMessage], node: str,
+                    token_budget: int = None) -> List[BaseMessage]:
+    """
+    Apply the message-window policy for a node.
+
+    Messages are de-duplicated, the node's most recent turns are kept verbatim
+    and older turns are replaced by a summary sized to whatever budget remains.
+    """
+    token_budget = token_budget or settings.CONTEXT_TOKEN_BUDGET
+    keep_last = NODE_CONTEXT_POLICY.get(node, len(messages))
+
+    unique = deduplicate_messages(messages)
+    split = max(len(unique) - keep_last, 0)
+    older, recent = unique[:split], unique[split:]
+
+    # Never let the verbatim tail exceed the budget on its own
+    while len(recent) > 1 and estimate_tokens(recent) > token_budget:
+        older.append(recent.pop(0))
+
+    if not older:
+        return recent
+
+    remaining = min(token_budget - estimate_tokens(recent), settings.CONTEXT_SUMMARY_TOKENS)
+    if remaining <= 0:
+        return recent
+    return [summarize_messages(older, remaining)] + recent
+
+
+def log_prompt_tokens(node: str, messages: Sequence[BaseMessage]) -> int:
+    """Log and return the estimated prompt size sent by a node."""
+    tokens = estimate_tokens(messages)
+    logger.info(f"Prompt for node {node}: {len(messages)} messages, ~{tokens} tokens")
+    return tokens
@@ -1,12 +1,45 @@
+import functools
 import json
+import logging
 import re
+import time
 from typing import Dict, Any
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langgraph.types import Send
 
+from shared.cache import SQLiteTTLCache, normalize_text, canonical_hash
+from shared.metrics import registry as metrics_registry
+from shared.tracing import span
+
+from app.core.config import settings
+from app.graphs.context import window_messages, log_prompt_tokens
+from app.graphs.repair import repair_json_text, coerce_to_template
 from app.services.llm import LLMService
 
+logger = logging.getLogger(__name__)
+
 llm_service = LLMService()
 
+repair_outcomes = metrics_registry.counter(
+    "resume_repair_outcomes_total",
+    "How failed resume generations were resolved: repaired locally, re-asked, or retries exhausted.",
+    ("outcome",),
+)
+
+node_latency = metrics_registry.histogram(
+    "graph_node_duration_seconds",
+    "Time spent in each LangGraph node; outcome is error when the node raised or set an error.",
+    ("node", "outcome"),
+)
+
+# Job analyses are shared across users and workers, keyed by the normalized job description
+analysis_cache = SQLiteTTLCache(
+    settings.CACHE_DB_PATH,
+    "job_analysis",
+    ttl_seconds=settings.ANALYSIS_CACHE_TTL_SECONDS,
+    max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES
+)
+
 SYSTEM_PROMPT = """You are an expert resume builder agent designed to create tailored, professional resumes. Your task is to analyze job descriptions, match them with user profiles, and generate optimized resumes that follow specific templates.
 
 GUIDELINES:
@@ -29,10 +62,31 @@ Remember, the goal is to create a resume that will help the user stand out while
 """
 
 
+def timed_node(name: str):
+    """Record how long a graph node takes and trace it, labelled by its name in the graph."""
+    def decorator(node):
+        @functools.wraps(node)
+        def wrapper(state):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                with span("graph.node", node=name) as node_span:
+                    update = node(state)
+                    if not (isinstance(update, dict) and update.get("error")):
+                        outcome = "ok"
+                    elif node_span:
+                        node_span.set(error=update["error"])
+                return update
+            finally:
+                node_latency.observe(time.perf_counter() - start, node=name, outcome=outcome)
+        return wrapper
+    return decorator
+
+
 def extract_json_from_text(text: str) -> Dict[str, Any]:
     """Extract JSON object from text with improved error handling."""
     # Find content between triple backticks
-    json_match = re.search(r"``````", text)
+    json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
     if json_match:
         json_str = json_match.group(1)
     else:
@@ -93,35 +147,67 @@ def validate_json_structure(json_data: Dict[str, Any], template: Dict[str, Any])
     return result
 
 
-def analyze_job(state):
-    """Analyze the job description and identify key requirements."""
-    llm = llm_service.get_llm()
-    
-    messages = [
-        SystemMessage(content=SYSTEM_PROMPT),
-        HumanMessage(content=f"""
+def job_analysis_cache_key(job_description: str) -> str:
+    """Return the analysis cache key for a job description."""
+    return canonical_hash(normalize_text(job_description))
+
+
+def build_analysis_prompt(job_description: str) -> HumanMessage:
+    """Build the STEP 1 prompt that asks for a job description analysis."""
+    return HumanMessage(content=f"""
         STEP 1: Analyze the job description below and identify the key requirements, skills, and qualifications:
         
         JOB DESCRIPTION:
-        {state["job_description"]}
+        {job_description}
         
         Please provide a detailed analysis of what the employer is looking for in an ideal candidate.
         """)
+
+
+@timed_node("lookup_job_analysis")
+def lookup_job_analysis(state):
+    """Load a cached analysis of the job description, if one exists."""
+    cached_analysis = analysis_cache.get(job_analysis_cache_key(state["job_description"]))
+    
+    if cached_analysis is None:
+        return {"analysis_cached": False}
+    
+    return {
+        "messages": [
+            build_analysis_prompt(state["job_description"]),
+            AIMessage(content=cached_analysis)
+        ],
+        "analysis_cached": True
+    }
+
+
+@timed_node("analyze_job")
+def analyze_job(state):
+    """Analyze the job description and identify key requirements."""
+    llm = llm_service.get_llm_for_node("analyze_job")
+    
+    messages = [
+        SystemMessage(content=SYSTEM_PROMPT),
+        build_analysis_prompt(state["job_description"])
     ]
+    log_prompt_tokens("analyze_job", messages)
     
     response = llm.invoke(messages)
     
+    analysis_cache.set(job_analysis_cache_key(state["job_description"]), response.content)
+    
     return {
-        "messages": state["messages"] + [messages[1], response]
+        "messages": [messages[1], response]
     }
 
 
+@timed_node("review_profile")
 def review_profile(state):
     """Review the user profile and match it with job requirements."""
-    llm = llm_service.get_llm()
+    llm = llm_service.get_llm_for_node("review_profile")
     
     # Get the previous analysis from the messages
-    previous_messages = state["messages"]
+    previous_messages = window_messages(state["messages"], "review_profile")
     
     profile_str = json.dumps(state["user_profile"], indent=2)
     
@@ -135,21 +221,23 @@ def review_profile(state):
         Please list the key elements from my profile that should be highlighted in the resume.
         """)
     ]
+    log_prompt_tokens("review_profile", messages)
     
     response = llm.invoke(messages)
     
     return {
-        "messages": state["messages"] + [messages[-1], response]
+        "messages": [messages[-1], response]
     }
 
 
+@timed_node("generate_resume")
 def generate_resume(state):
     """Generate the resume in JSON format according to the template."""
-    llm = llm_service.get_llm("llama-3.1-8b-instant")
+    llm = llm_service.get_llm_for_node("generate_resume")
     
     template_str = json.dumps(state["resume_template"], indent=2)
     
-    messages = state["messages"] + [
+    messages = window_messages(state["messages"], "generate_resume") + [
         HumanMessage(content=f"""
         STEP 3: Now, create my resume in JSON format that follows the exact structure of the provided template.
         
@@ -176,6 +264,68 @@ def generate_resume(state):
         ```
         """)
     ]
+    log_prompt_tokens("generate_resume", messages)
+    
+    response = llm.invoke(messages)
+    
+    # Extract and validate JSON
+    try:
+        raw_json = extract_json_from_text(response.content)
+        
+        if not raw_json:
+            return {
+                "messages": [messages[-1], response],
+                "raw_output": response.content,
+                "error": "Failed to extract valid JSON from the response."
+            }
+        
+        # Validate and fix JSON structure against the template
+        resume_json = validate_json_structure(raw_json, state["resume_template"])
+        
+        return {
+            "messages": [messages[-1], response],
+            "raw_output": response.content,
+            "resume_json": resume_json
+        }
+    except Exception as e:
+        return {
+            "messages": [messages[-1], response],
+            "raw_output": response.content,
+            "error": f"Error processing resume: {str(e)}"
+        }
+
+
+@timed_node("generate_resume_fast")
+def generate_resume_fast(state):
+    """Analyze the job, match the profile and generate the resume JSON in a single call."""
+    llm = llm_service.get_llm_for_node("generate_resume_fast")
+    
+    profile_str = json.dumps(state["user_profile"], indent=2)
+    template_str = json.dumps(state["resume_template"], indent=2)
+    
+    messages = [
+        SystemMessage(content=SYSTEM_PROMPT),
+        HumanMessage(content=f"""
+        Create my resume for the job below in one step: identify the key requirements of the job, pick the most relevant experiences, skills and achievements from my profile, and write a tailored resume.
+        
+        JOB DESCRIPTION:
+        {state["job_description"]}
+        
+        MY PROFILE:
+        {profile_str}
+        
+        TEMPLATE STRUCTURE:
+        {template_str}
+        
+        IMPORTANT: 
+        1. The output must be valid JSON that matches the EXACT structure of the template.
+        2. Include only the JSON object in your response, formatted with triple backticks.
+        3. All fields in the template must be present in your output.
+        4. Each section like "certifications" should appear EXACTLY ONCE in the output.
+        5. Make sure all brackets and braces are properly closed and balanced.
+        """)
+    ]
+    log_prompt_tokens("generate_resume_fast", messages)
     
     response = llm.invoke(messages)
     
@@ -185,7 +335,8 @@ def generate_resume(state):
         
         if not raw_json:
             return {
-                "messages": state["messages"] + [messages[-1], response],
+                "messages": [messages[-1], response],
+                "raw_output": response.content,
                 "error": "Failed to extract valid JSON from the response."
             }
         
@@ -193,26 +344,129 @@ def generate_resume(state):
         resume_json = validate_json_structure(raw_json, state["resume_template"])
         
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
+            "raw_output": response.content,
             "resume_json": resume_json
         }
     except Exception as e:
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
+            "raw_output": response.content,
             "error": f"Error processing resume: {str(e)}"
         }
 
 
+@timed_node("generate_section")
+def generate_section(state):
+    """Generate a single resume section in JSON format according to the template."""
+    llm = llm_service.get_llm_for_node("generate_section")
+    
+    section = state["section"]
+    template_str = json.dumps({section: state["resume_template"][section]}, indent=2)
+    
+    messages = window_messages(state["messages"], "generate_section") + [
+        HumanMessage(content=f"""
+        STEP 3: Now, create ONLY the "{section}" section of my resume in JSON format that follows the exact structure of the provided template.
+        
+        TEMPLATE STRUCTURE:
+        {template_str}
+        
+        Based on your analysis of the job requirements and my profile, create this tailored section in JSON format.
+        
+        IMPORTANT: 
+        1. The output must be valid JSON with "{section}" as its only top-level key.
+        2. Include only the JSON object in your response, formatted with triple backticks.
+        3. All fields in the template must be present in your output.
+        4. Focus on highlighting experiences and skills most relevant to the job description.
+        5. Make sure all brackets and braces are properly closed and balanced.
+        """)
+    ]
+    log_prompt_tokens("generate_section", messages)
+    
+    response = llm.invoke(messages)
+    
+    # Accept either {"section": value} or the bare section value
+    raw_json = extract_json_from_text(response.content)
+    if isinstance(raw_json, dict) and section in raw_json:
+        section_value = raw_json[section]
+    elif raw_json and isinstance(raw_json, type(state["resume_template"][section])):
+        section_value = raw_json
+    else:
+        section_value = None
+    
+    return {
+        "resume_sections": {section: section_value}
+    }
+
+
+@timed_node("merge_sections")
+def merge_resume_sections(state):
+    """Assemble the generated sections into one resume and validate it against the template."""
+    sections = state.get("resume_sections", {})
+    template = state["resume_template"]
+    
+    missing = [key for key in template if sections.get(key) is None]
+    if missing:
+        return {
+            "error": f"Failed to generate valid JSON for sections: {', '.join(missing)}."
+        }
+    
+    # Validate and fix JSON structure against the template
+    resume_json = validate_json_structure(sections, template)
+    
+    return {
+        "resume_json": resume_json
+    }
+
+
+@timed_node("repair_resume")
+def repair_resume(state):
+    """Try to recover the failed output locally before asking the model again."""
+    template = state["resume_template"]
+    repaired = coerce_to_template(repair_json_text(state.get("raw_output", "")), template)
+    
+    # Sections generated in parallel are kept; the repaired output fills the gaps
+    sections = {k: v for k, v in (state.get("resume_sections") or {}).items() if v is not None}
+    if sections:
+        repaired = {**(repaired or {}), **sections}
+    
+    if repaired and all(key in repaired for key in template):
+        repair_outcomes.inc(outcome="repaired")
+        return {
+            "resume_json": validate_json_structure(repaired, template),
+            "error": ""
+        }
+    
+    return {}
+
+
+@timed_node("handle_error")
 def handle_error(state):
-    """Handle errors in the resume generation process."""
-    llm = llm_service.get_llm()
+    """Re-ask the model for the resume, sending only the failing context."""
+    llm = llm_service.get_llm_for_node("handle_error")
+    
+    retry_count = state.get("retry_count", 0)
+    repair_outcomes.inc(outcome="reask")
+    
+    # Exponential backoff between re-asks; the first re-ask goes out immediately
+    if retry_count:
+        time.sleep(settings.RETRY_BACKOFF_SECONDS * (2 ** (retry_count - 1)))
     
     template_str = json.dumps(state["resume_template"], indent=2)
+    profile_str = json.dumps(state.get("user_profile", {}), indent=2)
+    previous_output = state.get("raw_output", "")[:settings.REPAIR_CONTEXT_CHARS]
     
-    messages = state["messages"] + [
+    messages = [
+        SystemMessage(content=SYSTEM_PROMPT),
         HumanMessage(content=f"""
         ERROR: {state["error"]}
         
+        Your previous response could not be used as a resume:
+        {previous_output or "(empty response)"}
+        
+        MY PROFILE:
+        {profile_str}
+        
         Please try again to create a valid JSON resume that exactly matches the template structure below:
         
         {template_str}
@@ -220,41 +474,49 @@ def handle_error(state):
         Your response should ONLY contain the JSON object wrapped in triple backticks, like this:
         
         ```
-        {
+        {{
           "field1": "value1",
           "field2": "value2",
           ...
-        }
+        }}
         ```
         """)
     ]
+    log_prompt_tokens("handle_error", messages)
     
     response = llm.invoke(messages)
     
     try:
-        resume_json = extract_json_from_text(response.content)
+        raw_json = extract_json_from_text(response.content)
         
-        if not resume_json:
+        if not raw_json:
             return {
-                "messages": state["messages"] + [messages[-1], response],
+                "messages": [messages[-1], response],
+                "raw_output": response.content,
+                "retry_count": retry_count + 1,
                 "error": "Still unable to extract valid JSON. Please check the template format."
             }
         
         return {
-            "messages": state["messages"] + [messages[-1], response],
-            "resume_json": resume_json,
+            "messages": [messages[-1], response],
+            "raw_output": response.content,
+            "retry_count": retry_count + 1,
+            "resume_json": validate_json_structure(raw_json, state["resume_template"]),
             "error": ""  # Clear the error
         }
     except Exception as e:
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
+            "raw_output": response.content,
+            "retry_count": retry_count + 1,
             "error": f"Error processing resume: {str(e)}"
         }
 
 
+@timed_node("conversational_update")
 def conversational_resume_editor(state):
     """Process user instructions to update the resume in a conversational manner."""
-    llm = llm_service.get_llm()
+    llm = llm_service.get_llm_for_node("conversational_update")
     
     # Get the current resume and user instruction
     current_resume = state.get("resume_json", {})
@@ -262,13 +524,13 @@ def conversational_resume_editor(state):
     
     if not current_resume:
         return {
-            "messages": state["messages"] + [
+            "messages": [
                 AIMessage(content="I need to generate a resume first before I can update it. Let me do that for you.")
             ],
             "error": "No resume to update. Please generate a resume first."
         }
     
-    messages = state["messages"] + [
+    messages = window_messages(state["messages"], "conversational_update") + [
         SystemMessage(content=f"""You are an expert resume editor. 
         You have a current resume in JSON format and need to update it based on the user's instructions.
         Current resume: {json.dumps(current_resume, indent=2)}
@@ -277,6 +539,7 @@ def conversational_resume_editor(state):
         Return only the updated JSON with no additional text or explanations."""),
         HumanMessage(content=f"Please update this resume according to the following instruction: {user_instruction}")
     ]
+    log_prompt_tokens("conversational_update", messages)
     
     response = llm.invoke(messages)
     
@@ -286,7 +549,7 @@ def conversational_resume_editor(state):
         
         if not updated_json:
             return {
-                "messages": state["messages"] + [messages[-1], response],
+                "messages": [messages[-1], response],
                 "error": "Failed to extract valid JSON from the response."
             }
         
@@ -294,17 +557,47 @@ def conversational_resume_editor(state):
         updated_resume = validate_json_structure(updated_json, state["resume_template"])
         
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
             "resume_json": updated_resume,
             "user_instruction": ""  # Clear the instruction after processing
         }
     except Exception as e:
         return {
-            "messages": state["messages"] + [messages[-1], response],
+            "messages": [messages[-1], response],
             "error": f"Error updating resume: {str(e)}"
         }
 
 
+def route_resume_sections(state):
+    """Fan out one section generation task per top-level template key."""
+    return [
+        Send("generate_section", {
+            "section": section,
+            "messages": state["messages"],
+            "resume_template": state["resume_template"]
+        })
+        for section in state["resume_template"]
+    ]
+
+
+def check_analysis_cache(state):
+    """Skip the job analysis when it was loaded from the cache."""
+    if state.get("analysis_cached", False):
+        return "review_profile"
+    return "analyze_job"
+
+
+def check_repair_outcome(state):
+    """Re-ask the model only if local repair failed and the retry budget allows it."""
+    if not state.get("error", ""):
+        return "end"
+    if state.get("retry_count", 0) < settings.MAX_RESUME_RETRIES:
+        return "handle_error"
+    repair_outcomes.inc(outcome="exhausted")
+    logger.warning(f"Resume retry budget exhausted after {state.get('retry_count', 0)} re-asks: {state['error']}")
+    return "end"
+
+
 def check_error_condition(state):
     """Check if there's an error that needs handling."""
     if state.get("error", ""):
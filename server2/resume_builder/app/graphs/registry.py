@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from shared.metrics import registry as metrics_registry
+from shared.tracing import span
+
+from app.graphs.builder import (
+    build_resume_builder_graph,
+    build_parallel_resume_builder_graph,
+    build_fast_resume_builder_graph,
+    build_resume_editor_graph
+)
+from app.services.checkpoints import checkpoint_service
+
+logger = logging.getLogger(__name__)
+
+graph_compile_seconds = metrics_registry.gauge(
+    "graph_compile_seconds",
+    "Time spent building and compiling each resume graph variant.",
+    ("graph",),
+)
+graph_invocations = metrics_registry.counter(
+    "graph_invocations_total",
+    "Resume graph invocations by variant and outcome.",
+    ("graph", "status"),
+)
+
+
+class GraphRegistry:
+    """
+    Compiles each graph variant once and hands out the shared compiled graph.
+
+    Compiled graphs keep no per-run state of their own (checkpointed variants
+    scope state by thread ID), so one instance can be invoked from many
+    requests concurrently.
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], Any]] = {}
+        self._graphs: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, builder: Callable[[], Any]) -> None:
+        """Register a graph builder under a variant name."""
+        with self._lock:
+            self._builders[name] = builder
+            self._graphs.pop(name, None)
+            self._stats[name] = {
+                "compile_seconds": 0.0,
+                "invocations": 0,
+                "errors": 0,
+                "total_seconds": 0.0
+            }
+
+    def compile_all(self) -> None:
+        """Compile every registered variant (called once at startup)."""
+        for name in list(self._builders):
+            self.get(name)
+
+    def get(self, name: str) -> Any:
+        """Return the compiled graph for a variant, compiling it on first use."""
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+
+        with self._lock:
+            if name not in self._builders:
+                raise KeyError(f"Unknown graph variant: {name}")
+            graph = self._graphs.get(name)
+            if graph is None:
+                start = time.perf_counter()
+                graph = self._builders[name]()
+                elapsed = time.perf_counter() - start
+                self._graphs[name] = graph
+                self._stats[name]["compile_seconds"] = elapsed
+                graph_compile_seconds.set(elapsed, graph=name)
+                logger.info(f"Compiled graph {name} in {elapsed:.3f}s")
+        return graph
+
+    def invoke(self, name: str, state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a variant and record its invocation statistics."""
+        graph = self.get(name)
+        start = time.perf_counter()
+        status = "success"
+        try:
+            with span("graph.invoke", graph=name):
+                return graph.invoke(state, config=config)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats[name]
+                stats["invocations"] += 1
+                stats["total_seconds"] += elapsed
+                if status == "error":
+                    stats["errors"] += 1
+            graph_invocations.inc(graph=name, status=status)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return compile time and invocation statistics per variant."""
+        with self._lock:
+            result = {}
+            for name, stats in self._stats.items():
+                invocations = stats["invocations"]
+                result[name] = {
+                    "compiled": name in self._graphs,
+                    "compile_seconds": stats["compile_seconds"],
+                    "invocations": invocations,
+                    "errors": stats["errors"],
+                    "avg_seconds": stats["total_seconds"] / invocations if invocations else 0.0
+                }
+            return result
+
+
+graph_registry = GraphRegistry()
+# Build variants checkpoint every node so failed builds can resume mid-pipeline
+graph_registry.register("full", lambda: build_resume_builder_graph(checkpointer=checkpoint_service.saver))
+graph_registry.register("parallel", lambda: build_parallel_resume_builder_graph(checkpointer=checkpoint_service.saver))
+graph_registry.register("fast", lambda: build_fast_resume_builder_graph(checkpointer=checkpoint_service.saver))
+graph_registry.register("edit", build_resume_editor_graph)
+# Stateless copy of the full pipeline for LangServe, which does not pass a thread ID
+graph_registry.register("langserve", build_resume_builder_graph)
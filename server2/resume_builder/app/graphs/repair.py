@@ -0,0 +1,118 @@
+import ast
+import json
+import re
+from typing import Any, Dict, Optional
+
+FENCED_BLOCK = re.compile(r"```(?:json|JSON)?\s*([\s\S]*?)(?:```|$)")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def _balance_brackets(text: str) -> str:
+    """Close any string, object or array left open by a truncated response."""
+    stack = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack and stack[-1] == char:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+    # A dangling key or comma cannot be closed meaningfully, so drop it
+    text = re.sub(r'(,\s*"[^"]*"\s*:?\s*|,\s*)$', "", text.rstrip())
+    return text + "".join(reversed(stack))
+
+
+def repair_json_text(text: str) -> Optional[Any]:
+    """
+    Parse model output that is almost JSON without calling the model again.
+
+    Handles code fences, prose around the object, smart quotes, trailing
+    commas, truncated output and Python-style literals. Returns None when
+    nothing usable can be recovered.
+    """
+    if not text:
+        return None
+
+    fenced = FENCED_BLOCK.search(text)
+    candidate = fenced.group(1) if fenced else text
+    start = candidate.find("{")
+    if start == -1:
+        return None
+    candidate = candidate[start:].translate(SMART_QUOTES)
+    end = candidate.rfind("}")
+
+    # Complete object followed by prose first, then a truncated response
+    attempts = [candidate[:end + 1]] if end != -1 else []
+    attempts += [_balance_brackets(candidate)]
+    if end != -1:
+        attempts.append(_balance_brackets(candidate[:end + 1]))
+
+    for attempt in attempts:
+        attempt = re.sub(r",(\s*[\]}])", r"\1", attempt)
+        try:
+            return json.loads(attempt)
+        except json.JSONDecodeError:
+            pass
+        try:
+            pythonic = re.sub(r"\btrue\b", "True", re.sub(r"\bfalse\b", "False", re.sub(r"\bnull\b", "None", attempt)))
+            return ast.literal_eval(pythonic)
+        except (ValueError, SyntaxError):
+            pass
+    return None
+
+
+def _coerce_value(value: Any, template_value: Any) -> Any:
+    """Coerce a generated value towards the shape of its template value."""
+    if isinstance(template_value, list):
+        item_template = template_value[0] if template_value else None
+        if isinstance(value, dict):
+            value = [value]
+        elif isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            return template_value
+        if isinstance(item_template, dict) and item_template:
+            first_key = next(iter(item_template))
+            # e.g. skills: ["Python"] -> [{"name": "Python", ...}]
+            return [
+                {first_key: item} if isinstance(item, str) else item
+                for item in value
+            ]
+        return value
+    if isinstance(template_value, dict):
+        if isinstance(value, dict):
+            return {k: _coerce_value(value[k], v) if k in value else v for k, v in template_value.items()}
+        if isinstance(value, str) and template_value:
+            return {**template_value, next(iter(template_value)): value}
+        return template_value
+    if isinstance(template_value, str) and isinstance(value, (int, float)):
+        return str(value)
+    return value
+
+
+def coerce_to_template(data: Any, template: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Reshape parsed output so its sections match the template, or return None."""
+    if not isinstance(data, dict):
+        return None
+
+    # Unwrap {"resume": {...}} style envelopes
+    if not set(data) & set(template) and len(data) == 1:
+        inner = next(iter(data.values()))
+        if isinstance(inner, dict):
+            data = inner
+
+    if not set(data) & set(template):
+        return None
+    return {key: _coerce_value(data[key], value) for key, value in template.items() if key in data}
@@ -1,11 +1,19 @@
 import os
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from langserve import add_routes
 from dotenv import load_dotenv
 
-from app.api.routes import resume, memory
-from app.graphs.builder import build_resume_builder_graph
+from shared.http_metrics import RequestMetricsMiddleware
+from shared.metrics import registry, PROMETHEUS_CONTENT_TYPE
+from shared.tracing import TracingMiddleware
+
+from app.api.routes import resume, memory, graphs
+from app.graphs.registry import graph_registry
+from app.services.checkpoints import checkpoint_service
+from app.services.memory import run_memory_sweeper
 
 # Load environment variables
 load_dotenv()
@@ -26,14 +34,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request latency per route and trace every request
+app.add_middleware(TracingMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Add API routes
 app.include_router(resume.router, prefix="/api/resume", tags=["resume"])
 app.include_router(memory.router, prefix="/api/memory", tags=["memory"])
+app.include_router(graphs.router, prefix="/api/graphs", tags=["graphs"])
+
+# Compile every graph variant once; requests reuse the compiled graphs
+graph_registry.compile_all()
+
+# Drop checkpoints left behind by builds that were never resumed
+checkpoint_service.cleanup_expired()
+
+@app.on_event("startup")
+async def start_memory_sweeper():
+    # Expire old resumes in the background so the store stays bounded
+    app.state.memory_sweeper = asyncio.create_task(run_memory_sweeper())
+
+@app.on_event("shutdown")
+async def stop_memory_sweeper():
+    app.state.memory_sweeper.cancel()
 
 # Add LangServe routes for direct graph access
 add_routes(
     app,
-    build_resume_builder_graph(),
+    graph_registry.get("langserve"),
     path="/api/langserve/resume-builder",
 )
 
@@ -45,6 +73,11 @@ async def root():
         "api_version": "1.0.0"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Expose process metrics in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
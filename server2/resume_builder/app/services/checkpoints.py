@@ -0,0 +1,124 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointService:
+    """
+    Persists resume graph checkpoints in a local SQLite file keyed by build ID.
+
+    A build that fails part-way keeps its checkpoints so a retry can resume
+    from the last completed node. Successful builds delete their checkpoints,
+    and abandoned ones are removed once they are older than the TTL.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, cleanup_interval_seconds: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self._saver: Optional[SqliteSaver] = None
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    @property
+    def saver(self) -> SqliteSaver:
+        """Return the shared checkpointer, opening the database on first use."""
+        if self._saver is None:
+            with self._lock:
+                if self._saver is None:
+                    conn = self._connect()
+                    conn.execute(
+                        """CREATE TABLE IF NOT EXISTS resume_builds (
+                            build_id TEXT PRIMARY KEY,
+                            user_id TEXT NOT NULL,
+                            variant TEXT NOT NULL,
+                            created_at REAL NOT NULL
+                        )"""
+                    )
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS idx_resume_builds_created ON resume_builds (created_at)"
+                    )
+                    saver = SqliteSaver(conn)
+                    saver.setup()
+                    self._saver = saver
+        return self._saver
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _execute(self, query: str, params: tuple = ()) -> List[tuple]:
+        saver = self.saver
+        with saver.lock:
+            return saver.conn.execute(query, params).fetchall()
+
+    @staticmethod
+    def config(build_id: str) -> Dict[str, Any]:
+        """Return the graph config that scopes checkpoints to a build."""
+        return {"configurable": {"thread_id": build_id}}
+
+    def register_build(self, build_id: str, user_id: str, variant: str) -> bool:
+        """
+        Record a build so it can be resumed or cleaned up later.
+
+        Returns False when the build ID is already registered to another user.
+        """
+        self._execute(
+            "INSERT OR IGNORE INTO resume_builds (build_id, user_id, variant, created_at) VALUES (?, ?, ?, ?)",
+            (build_id, user_id, variant, time.time())
+        )
+        if time.time() - self._last_cleanup > self.cleanup_interval_seconds:
+            self.cleanup_expired()
+        build = self.get_build(build_id)
+        return build is not None and build["user_id"] == user_id
+
+    def get_build(self, build_id: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded build, or None if it does not exist."""
+        rows = self._execute(
+            "SELECT user_id, variant, created_at FROM resume_builds WHERE build_id = ?",
+            (build_id,)
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return {"build_id": build_id, "user_id": row[0], "variant": row[1], "created_at": row[2]}
+
+    def delete_build(self, build_id: str) -> None:
+        """Delete a build and all of its checkpoints."""
+        self.saver.delete_thread(build_id)
+        self._execute("DELETE FROM resume_builds WHERE build_id = ?", (build_id,))
+
+    def cleanup_expired(self) -> int:
+        """Delete builds older than the TTL and return how many were removed."""
+        self._last_cleanup = time.time()
+        cutoff = self._last_cleanup - self.ttl_seconds
+        expired = [
+            row[0] for row in self._execute(
+                "SELECT build_id FROM resume_builds WHERE created_at < ?", (cutoff,)
+            )
+        ]
+        for build_id in expired:
+            self.delete_build(build_id)
+        if expired:
+            logger.info(f"Removed checkpoints for {len(expired)} expired builds")
+        return len(expired)
+
+
+checkpoint_service = CheckpointService(
+    settings.CHECKPOINT_DB_PATH,
+    ttl_seconds=settings.CHECKPOINT_TTL_SECONDS,
+    cleanup_interval_seconds=settings.CHECKPOINT_CLEANUP_INTERVAL_SECONDS
+)
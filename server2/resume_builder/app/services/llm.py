@@ -1,17 +1,25 @@
 import os
-from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
+from shared.llm_provider import create_chat_model
+
+from app.core.config import settings
+from app.services.routing import RoutedLLM, model_router
+
 
 class LLMService:
     def __init__(self):
-        self.default_model = "llama-3.3-70b-versatile"
-        self.fallback_model = "llama-3.1-8b-instant"
+        self.default_model = settings.DEFAULT_MODEL
+        self.fallback_model = settings.FALLBACK_MODEL
     
     def get_llm(self, model=None, temperature=0.2):
         """Get the language model based on provider."""
-        return ChatGroq(
+        return create_chat_model(
             model=model or self.default_model,
             temperature=temperature,
             max_retries=2
         )
+    
+    def get_llm_for_node(self, node, temperature=0.2):
+        """Get a model that is routed per call based on prompt size and model health."""
+        return RoutedLLM(model_router, self, node, temperature=temperature)
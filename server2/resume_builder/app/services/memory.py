@@ -1,51 +1,160 @@
+import asyncio
+import base64
+import json
+import logging
 import uuid
+import time
 import datetime
 from typing import Dict, List, Any, Optional
-from langgraph.store.memory import InMemoryStore
+
+from fastapi.concurrency import run_in_threadpool
+
+from shared.metrics import registry
+from shared.tracing import span
+
+from app.core.config import settings
+from app.services.memory_store import PageCursor, create_memory_backend
+from app.services.resume_index import resume_index
 
 # Create memory store
-memory_store = InMemoryStore()
+memory_store = create_memory_backend(
+    settings.MEMORY_BACKEND,
+    settings.MEMORY_DB_PATH,
+    cache_size=settings.MEMORY_CACHE_SIZE,
+    sync_seconds=settings.MEMORY_CACHE_SYNC_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+memory_deletions = registry.counter(
+    "memory_deletions_total",
+    "Stored resumes removed, by reason (user request, per-user cap or TTL expiry).",
+    ("reason",),
+)
+memory_store_size = registry.gauge(
+    "memory_store_size",
+    "Size of the resume memory store: memories, users, section blobs and blob bytes.",
+    ("kind",),
+)
+for _kind in ("memories", "users", "blobs", "blob_bytes"):
+    memory_store_size.set_function(lambda kind=_kind: memory_store.stats()[kind], kind=_kind)
+
+
+def encode_cursor(cursor: PageCursor) -> str:
+    """Encode a pagination position as an opaque URL-safe token."""
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str) -> PageCursor:
+    """Decode a token produced by encode_cursor, raising ValueError if it is malformed."""
+    try:
+        created_at, memory_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return float(created_at), str(memory_id)
+    except Exception as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def _to_history_item(memory: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "memory_id": memory["memory_id"],
+        "data": memory["value"],
+        "created_at": datetime.datetime.fromtimestamp(memory["created_at"], tz=datetime.timezone.utc)
+    }
 
 
 class MemoryService:
     @staticmethod
     def store_resume(user_id: str, job_description: str, resume: Dict[str, Any]) -> str:
         """Store a resume in memory and return the memory ID."""
-        namespace = (user_id, "resumes")
         memory_id = str(uuid.uuid4())
-        
+
         memory_data = {
             "job_description": job_description,
             "resume": resume,
             "timestamp": datetime.datetime.now().isoformat()
         }
-        
-        memory_store.put(namespace, memory_id, memory_data)
-        
+
+        with span("memory.store"):
+            memory_store.put(user_id, memory_id, memory_data, time.time())
+
+            # Keep only the newest versions once a user reaches the cap
+            if settings.MEMORY_MAX_VERSIONS_PER_USER > 0:
+                trimmed = memory_store.trim(user_id, settings.MEMORY_MAX_VERSIONS_PER_USER)
+                if trimmed:
+                    memory_deletions.inc(len(trimmed), reason="cap")
+                    resume_index.remove_keys(trimmed)
+
         return memory_id
-    
+
     @staticmethod
     def get_previous_resumes(user_id: str) -> List[Dict]:
         """Retrieve all previous resumes for a user from memory."""
-        namespace = (user_id, "resumes")
-        memories = memory_store.search(namespace)
-        
-        resumes = []
-        for memory in memories:
-            resumes.append({
-                "memory_id": memory.key,
-                "data": memory.value,
-                "created_at": memory.created_at
-            })
-        
-        return resumes
-    
+        memories = memory_store.list(user_id)
+        return [_to_history_item(memory) for memory in memories]
+
+    @staticmethod
+    def list_resumes(user_id: str, limit: int = 20, cursor: Optional[str] = None,
+                     order: str = "desc", view: str = "metadata") -> Dict[str, Any]:
+        """
+        Return one page of a user's resumes sorted by creation time.
+
+        The metadata view leaves out resume bodies and shortens job
+        descriptions; the full view returns complete memories. Pass the
+        returned next_cursor back to fetch the following page.
+        """
+        memories = memory_store.list_page(
+            user_id,
+            limit + 1,
+            cursor=decode_cursor(cursor) if cursor else None,
+            descending=order == "desc",
+            full=view == "full"
+        )
+
+        # The extra row only tells us whether another page exists
+        next_cursor = None
+        if len(memories) > limit:
+            memories = memories[:limit]
+            last = memories[-1]
+            next_cursor = encode_cursor((last["created_at"], last["memory_id"]))
+
+        return {
+            "items": [_to_history_item(memory) for memory in memories],
+            "next_cursor": next_cursor
+        }
+
     @staticmethod
     def get_resume_by_id(user_id: str, memory_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a specific resume by memory ID."""
-        namespace = (user_id, "resumes")
+        memory = memory_store.get(user_id, memory_id)
+        return memory["value"] if memory else None
+
+    @staticmethod
+    def delete_memory(user_id: str, memory_id: str) -> bool:
+        """Delete a specific resume and return whether it existed."""
+        deleted = memory_store.delete(user_id, memory_id)
+        if deleted:
+            memory_deletions.inc(reason="user")
+            resume_index.remove(user_id, [memory_id])
+        return deleted
+
+    @staticmethod
+    def sweep_expired() -> int:
+        """Delete resumes older than the configured TTL and return how many were removed."""
+        if settings.MEMORY_TTL_SECONDS <= 0:
+            return 0
+        expired = memory_store.delete_older_than(time.time() - settings.MEMORY_TTL_SECONDS)
+        if expired:
+            memory_deletions.inc(len(expired), reason="ttl")
+            resume_index.remove_keys(expired)
+            logger.info(f"Removed {len(expired)} expired resumes")
+        return len(expired)
+
+
+async def run_memory_sweeper() -> None:
+    """Background task that expires old resumes every MEMORY_SWEEP_INTERVAL_SECONDS."""
+    while True:
         try:
-            memory = memory_store.get(namespace, memory_id)
-            return memory
-        except:
-            return None
+            await run_in_threadpool(MemoryService.sweep_expired)
+        except Exception as e:
+            logger.warning(f"Memory sweep failed: {e}")
+        await asyncio.sleep(settings.MEMORY_SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,510 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.metrics import registry
+
+memory_cache_requests = registry.counter(
+    "memory_cache_requests_total",
+    "Memory reads by result: served from the in-process LRU (hit) or the backend (miss).",
+    ("result",),
+)
+
+# A stored memory: {"memory_id", "user_id", "value", "created_at"} with
+# created_at as a UNIX timestamp in seconds.
+MemoryRecord = Dict[str, Any]
+# (user_id, memory_id) of a stored memory
+MemoryKey = Tuple[str, str]
+# Keyset pagination position: the (created_at, memory_id) of the last row seen
+PageCursor = Tuple[float, str]
+
+# How long the shared deletion log is kept for other workers to catch up
+DELETION_LOG_RETENTION_SECONDS = 86400
+
+# Characters of the job description kept in metadata-only listings
+JOB_DESCRIPTION_PREVIEW_CHARS = 200
+
+
+def project_metadata(value: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a memory value to the fields shown in a metadata-only listing."""
+    return {
+        "job_description": (value.get("job_description") or "")[:JOB_DESCRIPTION_PREVIEW_CHARS],
+        "timestamp": value.get("timestamp")
+    }
+
+
+def _after_cursor(record: MemoryRecord, cursor: Optional[PageCursor], descending: bool) -> bool:
+    if cursor is None:
+        return True
+    position = (record["created_at"], record["memory_id"])
+    return position < cursor if descending else position > cursor
+
+
+class MemoryBackend(ABC):
+    """Storage backend for user resume memories."""
+
+    @abstractmethod
+    def put(self, user_id: str, memory_id: str, value: Dict[str, Any], created_at: float) -> None:
+        """Store a memory under a user."""
+
+    @abstractmethod
+    def get(self, user_id: str, memory_id: str) -> Optional[MemoryRecord]:
+        """Return one memory, or None if the user has no memory with that ID."""
+
+    @abstractmethod
+    def list(self, user_id: str) -> List[MemoryRecord]:
+        """Return all memories for a user, oldest first."""
+
+    @abstractmethod
+    def list_page(self, user_id: str, limit: int, cursor: Optional[PageCursor] = None,
+                  descending: bool = True, full: bool = False) -> List[MemoryRecord]:
+        """
+        Return up to limit memories ordered by (created_at, memory_id), starting
+        after cursor. Unless full is set, values are reduced to project_metadata.
+        """
+
+    @abstractmethod
+    def delete(self, user_id: str, memory_id: str) -> bool:
+        """Delete one memory and return whether it existed."""
+
+    @abstractmethod
+    def trim(self, user_id: str, keep: int) -> List[MemoryKey]:
+        """Delete all but the newest keep memories of a user and return what was deleted."""
+
+    @abstractmethod
+    def delete_older_than(self, cutoff: float) -> List[MemoryKey]:
+        """Delete every memory created before cutoff and return what was deleted."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Return store size figures: memories, users, blobs and blob_bytes."""
+
+    def deletions_since(self, sequence: Optional[int]) -> Tuple[Optional[int], List[MemoryKey]]:
+        """
+        Return (latest sequence, memories deleted after sequence) so caches in
+        other processes can drop them. Passing None only returns the latest
+        sequence. Process-local backends have nothing to report.
+        """
+        return sequence, []
+
+
+class InMemoryBackend(MemoryBackend):
+    """Process-local backend; contents are lost on restart and not shared between workers."""
+
+    def __init__(self):
+        self._records: Dict[str, Dict[str, MemoryRecord]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, user_id: str, memory_id: str, value: Dict[str, Any], created_at: float) -> None:
+        record = {"memory_id": memory_id, "user_id": user_id, "value": value, "created_at": created_at}
+        with self._lock:
+            self._records.setdefault(user_id, {})[memory_id] = record
+
+    def get(self, user_id: str, memory_id: str) -> Optional[MemoryRecord]:
+        with self._lock:
+            return self._records.get(user_id, {}).get(memory_id)
+
+    def list(self, user_id: str) -> List[MemoryRecord]:
+        with self._lock:
+            records = list(self._records.get(user_id, {}).values())
+        return sorted(records, key=lambda record: record["created_at"])
+
+    def list_page(self, user_id: str, limit: int, cursor: Optional[PageCursor] = None,
+                  descending: bool = True, full: bool = False) -> List[MemoryRecord]:
+        records = sorted(
+            (record for record in self.list(user_id) if _after_cursor(record, cursor, descending)),
+            key=lambda record: (record["created_at"], record["memory_id"]),
+            reverse=descending
+        )[:limit]
+        if full:
+            return records
+        return [{**record, "value": project_metadata(record["value"])} for record in records]
+
+    def delete(self, user_id: str, memory_id: str) -> bool:
+        with self._lock:
+            return self._records.get(user_id, {}).pop(memory_id, None) is not None
+
+    def trim(self, user_id: str, keep: int) -> List[MemoryKey]:
+        stale = self.list(user_id)[:-keep] if keep > 0 else self.list(user_id)
+        with self._lock:
+            for record in stale:
+                self._records.get(user_id, {}).pop(record["memory_id"], None)
+        return [(user_id, record["memory_id"]) for record in stale]
+
+    def delete_older_than(self, cutoff: float) -> List[MemoryKey]:
+        deleted = []
+        with self._lock:
+            for user_id, records in list(self._records.items()):
+                for memory_id, record in list(records.items()):
+                    if record["created_at"] < cutoff:
+                        del records[memory_id]
+                        deleted.append((user_id, memory_id))
+                if not records:
+                    del self._records[user_id]
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memories": sum(len(records) for records in self._records.values()),
+                "users": sum(1 for records in self._records.values() if records),
+                "blobs": 0,
+                "blob_bytes": 0
+            }
+
+
+class SQLiteMemoryBackend(MemoryBackend):
+    """
+    Memories stored in a SQLite file in WAL mode.
+
+    Every worker process that points at the same file shares the memories,
+    and they survive restarts. Listings are served from the
+    (user_id, created_at) index.
+
+    Resumes are stored as content-addressed section blobs: each top-level
+    section is kept once per distinct content, and a version only records
+    which blob it uses for each section. An edit that touches one section adds
+    one blob, so storage grows with the size of edits rather than their number.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS memories (
+                    memory_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    value TEXT NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memories_user_created ON memories (user_id, created_at)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_created ON memories (created_at)")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS resume_blobs (
+                    hash TEXT PRIMARY KEY,
+                    content TEXT NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS resume_sections (
+                    memory_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (memory_id, position)
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_sections_hash ON resume_sections (hash)")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS memory_deletions (
+                    sequence INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    memory_id TEXT NOT NULL,
+                    deleted_at REAL NOT NULL
+                )"""
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _split_resume(value: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple[str, str, str]]]:
+        """Separate the resume from a memory value as (name, hash, content) sections."""
+        resume = value.get("resume")
+        if not isinstance(resume, dict):
+            return value, []
+        sections = []
+        for name, content in resume.items():
+            payload = json.dumps(content, separators=(",", ":"), ensure_ascii=False, default=str)
+            sections.append((name, hashlib.sha256(payload.encode("utf-8")).hexdigest(), payload))
+        return {key: item for key, item in value.items() if key != "resume"}, sections
+
+    def _to_records(self, conn: sqlite3.Connection, rows: List[tuple], full: bool = True) -> List[MemoryRecord]:
+        """Build records from memory rows, reassembling resumes from their section blobs."""
+        resumes: Dict[str, Dict[str, Any]] = {}
+        memory_ids = [row[0] for row in rows]
+        if full and memory_ids:
+            placeholders = ", ".join("?" for _ in memory_ids)
+            for memory_id, name, content in conn.execute(
+                f"""SELECT s.memory_id, s.name, b.content
+                    FROM resume_sections s JOIN resume_blobs b ON b.hash = s.hash
+                    WHERE s.memory_id IN ({placeholders})
+                    ORDER BY s.memory_id, s.position""",
+                memory_ids,
+            ):
+                resumes.setdefault(memory_id, {})[name] = json.loads(content)
+
+        records = []
+        for row in rows:
+            value = json.loads(row[3])
+            # Memories written before section storage keep the resume inline
+            if full and "resume" not in value:
+                value["resume"] = resumes.get(row[0], {})
+            records.append({"memory_id": row[0], "user_id": row[1], "created_at": row[2], "value": value})
+        return records
+
+    def put(self, user_id: str, memory_id: str, value: Dict[str, Any], created_at: float) -> None:
+        value, sections = self._split_resume(value)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO memories (memory_id, user_id, created_at, value) VALUES (?, ?, ?, ?)",
+                (memory_id, user_id, created_at, json.dumps(value, default=str)),
+            )
+            conn.execute("DELETE FROM resume_sections WHERE memory_id = ?", (memory_id,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO resume_blobs (hash, content) VALUES (?, ?)",
+                [(digest, payload) for _, digest, payload in sections],
+            )
+            conn.executemany(
+                "INSERT INTO resume_sections (memory_id, position, name, hash) VALUES (?, ?, ?, ?)",
+                [(memory_id, position, name, digest) for position, (name, digest, _) in enumerate(sections)],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, user_id: str, memory_id: str) -> Optional[MemoryRecord]:
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT memory_id, user_id, created_at, value FROM memories WHERE memory_id = ? AND user_id = ?",
+            (memory_id, user_id),
+        ).fetchall()
+        return self._to_records(conn, rows)[0] if rows else None
+
+    def list(self, user_id: str) -> List[MemoryRecord]:
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT memory_id, user_id, created_at, value FROM memories WHERE user_id = ? ORDER BY created_at",
+            (user_id,),
+        ).fetchall()
+        return self._to_records(conn, rows)
+
+    def list_page(self, user_id: str, limit: int, cursor: Optional[PageCursor] = None,
+                  descending: bool = True, full: bool = False) -> List[MemoryRecord]:
+        # Metadata listings pull only the preview fields out of the stored JSON
+        columns = "value" if full else (
+            "json_object('job_description', substr(coalesce(json_extract(value, '$.job_description'), ''), 1, ?), "
+            "'timestamp', json_extract(value, '$.timestamp'))"
+        )
+        params: List[Any] = [] if full else [JOB_DESCRIPTION_PREVIEW_CHARS]
+        params.append(user_id)
+        query = f"SELECT memory_id, user_id, created_at, {columns} FROM memories WHERE user_id = ?"
+        if cursor is not None:
+            op = "<" if descending else ">"
+            query += f" AND (created_at {op} ? OR (created_at = ? AND memory_id {op} ?))"
+            params += [cursor[0], cursor[0], cursor[1]]
+        direction = "DESC" if descending else "ASC"
+        query += f" ORDER BY created_at {direction}, memory_id {direction} LIMIT ?"
+        params.append(limit)
+
+        conn = self._connect()
+        rows = conn.execute(query, params).fetchall()
+        return self._to_records(conn, rows, full=full)
+
+    def _delete_keys(self, conn: sqlite3.Connection, keys: List[MemoryKey]) -> None:
+        """Delete memories and any section blobs no other memory references."""
+        if not keys:
+            return
+        memory_ids = [memory_id for _, memory_id in keys]
+        placeholders = ", ".join("?" for _ in memory_ids)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            hashes = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT hash FROM resume_sections WHERE memory_id IN ({placeholders})", memory_ids
+            )]
+            conn.execute(f"DELETE FROM memories WHERE memory_id IN ({placeholders})", memory_ids)
+            conn.execute(f"DELETE FROM resume_sections WHERE memory_id IN ({placeholders})", memory_ids)
+            conn.executemany(
+                """DELETE FROM resume_blobs WHERE hash = ?
+                   AND NOT EXISTS (SELECT 1 FROM resume_sections WHERE hash = ?)""",
+                [(digest, digest) for digest in hashes],
+            )
+            # Tell the read caches of other workers which memories are gone
+            deleted_at = time.time()
+            conn.executemany(
+                "INSERT INTO memory_deletions (user_id, memory_id, deleted_at) VALUES (?, ?, ?)",
+                [(user_id, memory_id, deleted_at) for user_id, memory_id in keys],
+            )
+            # Prune the log here rather than in the TTL sweep, which may never run
+            conn.execute(
+                "DELETE FROM memory_deletions WHERE deleted_at < ?", (deleted_at - DELETION_LOG_RETENTION_SECONDS,)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, user_id: str, memory_id: str) -> bool:
+        conn = self._connect()
+        exists = conn.execute(
+            "SELECT 1 FROM memories WHERE memory_id = ? AND user_id = ?", (memory_id, user_id)
+        ).fetchone()
+        if exists:
+            self._delete_keys(conn, [(user_id, memory_id)])
+        return exists is not None
+
+    def trim(self, user_id: str, keep: int) -> List[MemoryKey]:
+        conn = self._connect()
+        keys = [(user_id, row[0]) for row in conn.execute(
+            """SELECT memory_id FROM memories WHERE user_id = ?
+               ORDER BY created_at DESC, memory_id DESC LIMIT -1 OFFSET ?""",
+            (user_id, keep),
+        )]
+        self._delete_keys(conn, keys)
+        return keys
+
+    def delete_older_than(self, cutoff: float, batch_size: int = 500) -> List[MemoryKey]:
+        conn = self._connect()
+        deleted: List[MemoryKey] = []
+        # Delete in batches so a large sweep does not hold the write lock for long
+        while True:
+            keys = [(row[0], row[1]) for row in conn.execute(
+                "SELECT user_id, memory_id FROM memories WHERE created_at < ? LIMIT ?", (cutoff, batch_size)
+            )]
+            if not keys:
+                break
+            self._delete_keys(conn, keys)
+            deleted += keys
+        return deleted
+
+    def deletions_since(self, sequence: Optional[int]) -> Tuple[Optional[int], List[MemoryKey]]:
+        conn = self._connect()
+        if sequence is None:
+            row = conn.execute("SELECT COALESCE(MAX(sequence), 0) FROM memory_deletions").fetchone()
+            return row[0], []
+        rows = conn.execute(
+            "SELECT sequence, user_id, memory_id FROM memory_deletions WHERE sequence > ? ORDER BY sequence",
+            (sequence,),
+        ).fetchall()
+        if not rows:
+            return sequence, []
+        return rows[-1][0], [(row[1], row[2]) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connect()
+        memories, users = conn.execute("SELECT COUNT(*), COUNT(DISTINCT user_id) FROM memories").fetchone()
+        blobs, blob_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(content)), 0) FROM resume_blobs").fetchone()
+        return {"memories": memories, "users": users, "blobs": blobs, "blob_bytes": blob_bytes}
+
+
+class CachedMemoryBackend(MemoryBackend):
+    """
+    Read-through LRU cache in front of another backend.
+
+    Only single-memory reads are cached. Memories are never modified after
+    they are stored, and deletions made through this instance evict the cached
+    copy. Deletions made by other workers are picked up from the backend's
+    deletion log at most sync_seconds after they happen.
+    """
+
+    def __init__(self, backend: MemoryBackend, max_entries: int, sync_seconds: float = 1.0):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.sync_seconds = sync_seconds
+        self._cache: "OrderedDict[tuple, MemoryRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sequence: Optional[int] = None
+        self._last_sync = 0.0
+
+    def _sync(self) -> None:
+        """Evict memories that other workers deleted since the last sync."""
+        now = time.monotonic()
+        if now - self._last_sync < self.sync_seconds:
+            return
+        self._last_sync = now
+        sequence, keys = self.backend.deletions_since(self._sequence)
+        self._forget(keys)
+        self._sequence = sequence
+
+    def _remember(self, key: tuple, record: MemoryRecord) -> None:
+        with self._lock:
+            self._cache[key] = record
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def put(self, user_id: str, memory_id: str, value: Dict[str, Any], created_at: float) -> None:
+        self._sync()
+        self.backend.put(user_id, memory_id, value, created_at)
+        self._remember(
+            (user_id, memory_id),
+            {"memory_id": memory_id, "user_id": user_id, "value": value, "created_at": created_at},
+        )
+
+    def get(self, user_id: str, memory_id: str) -> Optional[MemoryRecord]:
+        self._sync()
+        key = (user_id, memory_id)
+        with self._lock:
+            record = self._cache.get(key)
+            if record is not None:
+                self._cache.move_to_end(key)
+        if record is not None:
+            memory_cache_requests.inc(result="hit")
+            return record
+
+        memory_cache_requests.inc(result="miss")
+        record = self.backend.get(user_id, memory_id)
+        if record is not None:
+            self._remember(key, record)
+        return record
+
+    def _forget(self, keys: List[MemoryKey]) -> None:
+        with self._lock:
+            for key in keys:
+                self._cache.pop(key, None)
+
+    def list(self, user_id: str) -> List[MemoryRecord]:
+        return self.backend.list(user_id)
+
+    def list_page(self, user_id: str, limit: int, cursor: Optional[PageCursor] = None,
+                  descending: bool = True, full: bool = False) -> List[MemoryRecord]:
+        return self.backend.list_page(user_id, limit, cursor, descending, full)
+
+    def delete(self, user_id: str, memory_id: str) -> bool:
+        self._forget([(user_id, memory_id)])
+        return self.backend.delete(user_id, memory_id)
+
+    def trim(self, user_id: str, keep: int) -> List[MemoryKey]:
+        keys = self.backend.trim(user_id, keep)
+        self._forget(keys)
+        return keys
+
+    def delete_older_than(self, cutoff: float) -> List[MemoryKey]:
+        keys = self.backend.delete_older_than(cutoff)
+        self._forget(keys)
+        return keys
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.backend.stats(), "cached": len(self._cache)}
+
+
+def create_memory_backend(kind: str, path: str, cache_size: int, sync_seconds: float = 1.0) -> MemoryBackend:
+    """Build the configured memory backend ("sqlite" or "memory")."""
+    if kind == "sqlite":
+        backend: MemoryBackend = SQLiteMemoryBackend(path)
+    elif kind == "memory":
+        backend = InMemoryBackend()
+    else:
+        raise ValueError(f"Unknown memory backend: {kind}")
+    return CachedMemoryBackend(backend, cache_size, sync_seconds) if cache_size > 0 else backend
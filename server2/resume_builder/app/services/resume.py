@@ -1,10 +1,37 @@
 from typing import Dict, List, Any, Optional, Tuple
+import json
+import logging
 import uuid
 
+from shared.metrics import registry
+
+from app.core.config import settings
 from app.services.llm import LLMService
 from app.services.memory import MemoryService
-from app.graphs.builder import build_resume_builder_graph
-from app.graphs.nodes import conversational_resume_editor
+from app.services.checkpoints import checkpoint_service
+from app.services.resume_index import resume_index, UPDATE_PREFIX
+from app.graphs.registry import graph_registry
+from app.graphs.context import estimate_text_tokens
+
+logger = logging.getLogger(__name__)
+
+reuse_outcomes = registry.counter(
+    "resume_reuse_total",
+    "New builds by reuse outcome: edited from a similar past resume or built from scratch.",
+    ("outcome",),
+)
+
+class ResumeBuildError(Exception):
+    """Raised when a resume build fails; its owner can resume it by build ID."""
+    def __init__(self, message: str, build_id: str, user_id: str):
+        super().__init__(message)
+        self.build_id = build_id
+        self.user_id = user_id
+
+
+class BuildConflictError(Exception):
+    """Raised when a caller-supplied build ID is registered to another user."""
+
 
 class ResumeService:
     def __init__(self):
@@ -12,19 +39,49 @@ class ResumeService:
         self.memory_service = MemoryService()
     
     def build_resume(self, job_description: str, user_profile: Dict[str, Any], 
-                     resume_template: Dict[str, Any], user_id: Optional[str] = None) -> Tuple[Dict[str, Any], str, str]:
+                     resume_template: Dict[str, Any], user_id: Optional[str] = None,
+                     build_id: Optional[str] = None, mode: Optional[str] = None,
+                     reuse: bool = True) -> Tuple[Dict[str, Any], str, str]:
         """
         Build a resume using the AI agent and store it in memory.
         
+        Passing the build_id of one of the user's failed builds resumes it
+        from the last completed node instead of starting over; a build_id
+        registered to another user raises BuildConflictError. The mode picks the pipeline:
+        "thorough" runs analyze, review and generate, "fast" uses a single
+        call, and "auto" uses the single call for small inputs. When reuse is
+        set and the user already has a resume for a similar job description,
+        that resume is tailored with a single edit call instead.
+        
         Returns:
             Tuple containing (resume_json, memory_id, user_id)
         """
-        # Initialize the agent
-        resume_agent = build_resume_builder_graph()
+        if build_id and user_id and self._resumable_build(build_id, user_id):
+            return self.resume_build(build_id, user_id)
+        
+        # Pick the precompiled graph variant
+        variant = self.select_variant(mode or settings.DEFAULT_BUILD_MODE, job_description, user_profile)
         
-        # Generate user_id if not provided
+        # Anonymous callers get a fresh user_id, which has no resumes to reuse
+        anonymous = not user_id
+        
+        # Generate user_id and build_id if not provided
         if not user_id:
             user_id = str(uuid.uuid4())
+        if build_id:
+            existing = checkpoint_service.get_build(build_id)
+            if existing and existing["user_id"] != user_id:
+                raise BuildConflictError(f"Build {build_id} belongs to another user")
+            if existing:
+                # The user's own build with nothing left to resume; start its thread afresh
+                checkpoint_service.delete_build(build_id)
+        else:
+            build_id = str(uuid.uuid4())
+        
+        if reuse and not anonymous:
+            reused = self._reuse_similar_resume(job_description, user_profile, resume_template, user_id)
+            if reused:
+                return reused
         
         # Initialize the state
         initial_state = {
@@ -34,18 +91,132 @@ class ResumeService:
             "resume_template": resume_template,
             "resume_json": {},
             "error": "",
-            "user_instruction": ""
+            "user_instruction": "",
+            "resume_sections": {},
+            "analysis_cached": False,
+            "raw_output": "",
+            "retry_count": 0
         }
         
-        # Run the agent
-        final_state = resume_agent.invoke(initial_state)
+        # Another user may have registered the same ID since the check above
+        if not checkpoint_service.register_build(build_id, user_id, variant):
+            raise BuildConflictError(f"Build {build_id} belongs to another user")
+        return self._run_build(variant, initial_state, build_id, user_id)
+    
+    def _reuse_similar_resume(self, job_description: str, user_profile: Dict[str, Any],
+                              resume_template: Dict[str, Any], user_id: str) -> Optional[Tuple[Dict[str, Any], str, str]]:
+        """Tailor the user's resume for the most similar past job, or return None."""
+        threshold = settings.REUSE_SIMILARITY_THRESHOLD
+        if threshold <= 0:
+            return None
+        
+        for memory_id, score in resume_index.nearest(user_id, job_description):
+            if score < threshold:
+                break
+            previous = self.memory_service.get_resume_by_id(user_id, memory_id)
+            if not previous:
+                # The memory was deleted or expired since it was indexed
+                resume_index.remove(user_id, [memory_id])
+                continue
+            
+            instruction = (
+                "Tailor this resume for the following job description. Use only facts from the "
+                "current resume and the candidate profile.\n\n"
+                f"JOB DESCRIPTION:\n{job_description}\n\n"
+                f"CANDIDATE PROFILE:\n{json.dumps(user_profile, indent=2)}"
+            )
+            try:
+                final_state = graph_registry.invoke("edit", {
+                    "messages": [],
+                    "resume_json": previous["resume"],
+                    "resume_template": resume_template,
+                    "user_instruction": instruction,
+                    "error": ""
+                })
+            except Exception as e:
+                logger.warning(f"Reusing resume {memory_id} failed, building from scratch: {e}")
+                reuse_outcomes.inc(outcome="failed")
+                return None
+            if final_state.get("error") or not final_state.get("resume_json"):
+                reuse_outcomes.inc(outcome="failed")
+                return None
+            
+            logger.info(f"Reused resume {memory_id} (similarity {score:.2f}) for user {user_id}")
+            reuse_outcomes.inc(outcome="reused")
+            resume_json = final_state["resume_json"]
+            new_memory_id = self.memory_service.store_resume(user_id, job_description, resume_json)
+            resume_index.add(user_id, new_memory_id, job_description)
+            return resume_json, new_memory_id, user_id
+        
+        reuse_outcomes.inc(outcome="no_match")
+        return None
+    
+    @staticmethod
+    def select_variant(mode: str, job_description: str, user_profile: Dict[str, Any]) -> str:
+        """Map a build mode to a graph variant."""
+        if mode == "auto":
+            input_tokens = estimate_text_tokens(job_description) + estimate_text_tokens(json.dumps(user_profile))
+            mode = "fast" if input_tokens <= settings.FAST_MODE_MAX_TOKENS else "thorough"
+        
+        if mode == "fast":
+            return "fast"
+        if mode == "thorough":
+            return "parallel" if settings.PARALLEL_SECTIONS else "full"
+        raise ValueError(f"Unsupported build mode: {mode}")
+    
+    def resume_build(self, build_id: str, user_id: str) -> Tuple[Dict[str, Any], str, str]:
+        """
+        Resume one of the user's failed builds from its last checkpoint.
+        
+        Raises KeyError when the build does not exist, belongs to another
+        user, or has no checkpoint to continue from.
+        
+        Returns:
+            Tuple containing (resume_json, memory_id, user_id)
+        """
+        build = self._resumable_build(build_id, user_id)
+        if not build:
+            raise KeyError(f"No resumable build found for {build_id}")
+        
+        # Passing no input continues the thread from its last completed node
+        return self._run_build(build["variant"], None, build_id, build["user_id"])
+    
+    def _resumable_build(self, build_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the user's build if it has checkpointed state and nodes left to run."""
+        build = checkpoint_service.get_build(build_id)
+        if not build or build["user_id"] != user_id:
+            return None
+        # A build registered before its first checkpoint has nothing to resume
+        snapshot = graph_registry.get(build["variant"]).get_state(checkpoint_service.config(build_id))
+        return build if snapshot.values and snapshot.next else None
+    
+    def _run_build(self, variant: str, state: Optional[Dict[str, Any]], 
+                   build_id: str, user_id: str) -> Tuple[Dict[str, Any], str, str]:
+        # Run the agent; checkpoints survive a failure so the build can resume
+        try:
+            final_state = graph_registry.invoke(variant, state, checkpoint_service.config(build_id))
+        except Exception as e:
+            raise ResumeBuildError(str(e), build_id, user_id) from e
+        
+        if final_state.get("retry_count"):
+            logger.info(f"Build {build_id} needed {final_state['retry_count']} re-asks")
+        
+        # The retry budget ran out without a usable resume. The graph has
+        # finished, so there is nothing to resume and no build ID to offer
+        if final_state.get("error") and not final_state.get("resume_json"):
+            checkpoint_service.delete_build(build_id)
+            raise ValueError(final_state["error"])
         
         # Store the generated resume in memory
         memory_id = self.memory_service.store_resume(
             user_id, 
-            job_description, 
+            final_state["job_description"], 
             final_state["resume_json"]
         )
+        resume_index.add(user_id, memory_id, final_state["job_description"])
+        
+        # The build finished, so its checkpoints are no longer needed
+        checkpoint_service.delete_build(build_id)
         
         # Return the generated resume
         return final_state["resume_json"], memory_id, user_id
@@ -63,8 +234,8 @@ class ResumeService:
         }
         
         try:
-            # Process the update directly
-            update_state = conversational_resume_editor(update_state)
+            # Process the update with the edit-only graph
+            update_state = graph_registry.invoke("edit", update_state)
             
             if "error" in update_state and update_state["error"]:
                 raise ValueError(update_state["error"])
@@ -77,7 +248,7 @@ class ResumeService:
             # Store the updated resume in memory
             memory_id = self.memory_service.store_resume(
                 user_id, 
-                f"Updated via instruction: {instruction}", 
+                f"{UPDATE_PREFIX}{instruction}", 
                 updated_resume
             )
             
@@ -0,0 +1,198 @@
+import hashlib
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from shared.tracing import span
+
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+# ResumeService.update_resume stores this plus the instruction as the job description
+UPDATE_PREFIX = "Updated via instruction: "
+
+
+class ResumeIndex:
+    """
+    Per-user similarity index over the job descriptions of past builds.
+
+    Each user's entries live in one .npz file holding the memory IDs and a
+    matrix of hashed term counts. Queries weight terms by TF-IDF computed over
+    that user's documents and rank entries by cosine similarity. Writes take a
+    file lock and replace the file atomically, so every worker on the node can
+    share the directory.
+
+    Only job descriptions are indexed: the query is always a new job
+    description, and a user's resumes share most of their text (the same
+    profile), so resume terms would pull unrelated jobs above the reuse
+    threshold. When a user has no file yet, backfill(user_id) supplies
+    (memory_id, job_description) pairs for their existing memories, oldest
+    first, and the file is built from those. Users without entries have no
+    file: the last removal deletes it and empty backfills are not saved.
+    """
+
+    def __init__(self, directory: str, dimensions: int = 4096, max_entries: int = 0,
+                 backfill: Optional[Callable[[str], Iterable[Tuple[str, str]]]] = None):
+        self.directory = directory
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.backfill = backfill
+        self._lock = threading.Lock()
+
+    def _path(self, user_id: str) -> str:
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.npz")
+
+    @contextmanager
+    def _locked(self, path: str):
+        os.makedirs(self.directory, exist_ok=True)
+        # Users share 256 lock files by hash prefix, so lock files never pile up or need deleting
+        lock_path = os.path.join(self.directory, f"{os.path.basename(path)[:2]}.lock")
+        with self._lock, open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self, path: str) -> Tuple[np.ndarray, np.ndarray]:
+        if not os.path.exists(path):
+            return np.empty(0, dtype="<U64"), np.empty((0, self.dimensions), dtype=np.float32)
+        with np.load(path) as data:
+            return data["memory_ids"], data["counts"]
+
+    def _save(self, path: str, memory_ids: np.ndarray, counts: np.ndarray) -> None:
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, memory_ids=memory_ids, counts=counts)
+        os.replace(temp_path, path)
+
+    def _load_user(self, user_id: str, path: str,
+                   entries: Optional[List[Tuple[str, str]]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Load a user's entries, building the file from backfill if it is missing; call under the lock."""
+        if os.path.exists(path) or self.backfill is None:
+            return self._load(path)
+        with span("resume_index.backfill") as backfill_span:
+            if entries is None:
+                entries = list(self.backfill(user_id))
+            if not entries:
+                return self._load(path)
+            if self.max_entries > 0:
+                entries = entries[-self.max_entries:]
+            memory_ids = np.array([memory_id for memory_id, _ in entries], dtype="<U64")
+            counts = np.zeros((len(entries), self.dimensions), dtype=np.float32)
+            for row, (_, job_description) in enumerate(entries):
+                counts[row] = self.vectorize(job_description)
+            self._save(path, memory_ids, counts)
+            if backfill_span:
+                backfill_span.set(entries=len(entries))
+        return memory_ids, counts
+
+    def vectorize(self, text: str) -> np.ndarray:
+        """Return hashed term counts for a text."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in TOKEN_PATTERN.findall((text or "").lower()):
+            vector[zlib.crc32(token.encode("utf-8")) % self.dimensions] += 1
+        return vector
+
+    def add(self, user_id: str, memory_id: str, job_description: str) -> None:
+        """Index the job description a stored resume was built for."""
+        path = self._path(user_id)
+        with span("resume_index.add"), self._locked(path):
+            memory_ids, counts = self._load_user(user_id, path)
+            if memory_id in memory_ids:
+                # Already picked up by the backfill
+                return
+            memory_ids = np.append(memory_ids, memory_id).astype("<U64")
+            counts = np.vstack([counts, self.vectorize(job_description)[None, :]])
+            if self.max_entries > 0 and len(memory_ids) > self.max_entries:
+                memory_ids, counts = memory_ids[-self.max_entries:], counts[-self.max_entries:]
+            self._save(path, memory_ids, counts)
+
+    def remove(self, user_id: str, memory_ids: Iterable[str]) -> None:
+        """Drop entries whose memories no longer exist, deleting the file once it is empty."""
+        path = self._path(user_id)
+        if not os.path.exists(path):
+            return
+        with self._locked(path):
+            stored_ids, counts = self._load(path)
+            keep = ~np.isin(stored_ids, list(memory_ids))
+            if not keep.any():
+                if os.path.exists(path):
+                    os.remove(path)
+            elif not keep.all():
+                self._save(path, stored_ids[keep], counts[keep])
+
+    def remove_keys(self, keys: Iterable[Tuple[str, str]]) -> None:
+        """Drop entries for (user_id, memory_id) pairs, e.g. memories trimmed or expired."""
+        by_user = {}
+        for user_id, memory_id in keys:
+            by_user.setdefault(user_id, []).append(memory_id)
+        for user_id, memory_ids in by_user.items():
+            self.remove(user_id, memory_ids)
+
+    def nearest(self, user_id: str, job_description: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """Return up to limit (memory_id, cosine similarity) pairs, most similar first."""
+        with span("resume_index.nearest"):
+            path = self._path(user_id)
+            if os.path.exists(path):
+                memory_ids, counts = self._load(path)
+            else:
+                # Backfill outside the lock; users without history need neither lock nor file
+                entries = list(self.backfill(user_id)) if self.backfill else []
+                if not entries:
+                    return []
+                with self._locked(path):
+                    memory_ids, counts = self._load_user(user_id, path, entries)
+            if not len(memory_ids):
+                return []
+
+            # Smoothed IDF over this user's documents, sublinear term frequency
+            document_frequency = (counts > 0).sum(axis=0)
+            idf = np.log((1 + len(memory_ids)) / (1 + document_frequency)) + 1
+            documents = np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)), 0) * idf
+            query_counts = self.vectorize(job_description)
+            query = np.where(query_counts > 0, 1 + np.log(np.maximum(query_counts, 1)), 0) * idf
+
+            norms = np.linalg.norm(documents, axis=1) * np.linalg.norm(query)
+            scores = np.divide(documents @ query, norms, out=np.zeros(len(memory_ids)), where=norms > 0)
+            order = np.argsort(-scores)[:limit]
+            return [(str(memory_ids[i]), float(scores[i])) for i in order]
+
+
+def stored_job_descriptions(user_id: str) -> Iterator[Tuple[str, str]]:
+    """Yield (memory_id, job_description) for a user's stored builds, oldest first."""
+    # Imported here because the memory service imports this module
+    from app.services.memory import MemoryService
+
+    cursor = None
+    while True:
+        page = MemoryService.list_resumes(user_id, limit=100, cursor=cursor, order="asc", view="full")
+        for item in page["items"]:
+            job_description = item["data"].get("job_description") or ""
+            # Edits store their instruction instead of a job description
+            if job_description and not job_description.startswith(UPDATE_PREFIX):
+                yield item["memory_id"], job_description
+        cursor = page["next_cursor"]
+        if not cursor:
+            return
+
+
+resume_index = ResumeIndex(
+    settings.RESUME_INDEX_DIR,
+    dimensions=settings.RESUME_INDEX_DIMENSIONS,
+    max_entries=settings.MEMORY_MAX_VERSIONS_PER_USER,
+    backfill=stored_job_descriptions
+)
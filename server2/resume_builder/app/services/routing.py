@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from shared.metrics import registry
+
+from app.core.config import settings
+from app.graphs.context import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+route_decisions = registry.counter(
+    "llm_route_decisions_total",
+    "Model chosen for each graph node and the reason it was chosen.",
+    ("node", "model", "reason"),
+)
+route_failovers = registry.counter(
+    "llm_failovers_total",
+    "Calls retried on another model after the routed model failed.",
+    ("from_model", "to_model"),
+)
+circuit_state = registry.gauge(
+    "llm_circuit_state",
+    "Circuit breaker state per model (0 closed, 1 half-open, 2 open).",
+    ("model",),
+)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Nodes that default to the smaller, faster model; everything else uses the
+# default model. Mirrors the models the nodes used before routing existed.
+FAST_MODEL_NODES = {"generate_resume", "generate_section"}
+
+
+class ModelHealth:
+    """Rolling latency/error window and circuit breaker for one model."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.samples: Deque[Tuple[float, bool]] = deque(maxlen=settings.ROUTER_WINDOW_SIZE)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self._lock = threading.Lock()
+        circuit_state.set(_STATE_VALUES[CLOSED], model=model)
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Circuit for {self.model} changed from {self.state} to {state}")
+        self.state = state
+        circuit_state.set(_STATE_VALUES[state], model=self.model)
+
+    def p95_latency(self) -> float:
+        latencies = sorted(latency for latency, _ in self.samples)
+        if not latencies:
+            return 0.0
+        return latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def breaches_slo(self) -> bool:
+        if len(self.samples) < settings.ROUTER_MIN_SAMPLES:
+            return False
+        return (self.p95_latency() > settings.ROUTER_LATENCY_SLO_SECONDS
+                or self.error_rate() > settings.ROUTER_ERROR_RATE_THRESHOLD)
+
+    def allow_request(self) -> bool:
+        """Return True if the circuit lets a call through (claims the half-open probe)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= settings.ROUTER_COOLDOWN_SECONDS:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.samples.append((latency, ok))
+            self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+
+            if self.state == HALF_OPEN:
+                self.probe_in_flight = False
+                if ok and latency <= settings.ROUTER_LATENCY_SLO_SECONDS:
+                    # Start from a clean window so old samples do not re-open the circuit
+                    self.samples.clear()
+                    self._set_state(CLOSED)
+                else:
+                    self.opened_at = time.monotonic()
+                    self._set_state(OPEN)
+            elif self.state == CLOSED and (
+                self.consecutive_failures >= settings.ROUTER_FAILURE_THRESHOLD or self.breaches_slo()
+            ):
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "samples": len(self.samples),
+                "p95_latency_s": self.p95_latency(),
+                "error_rate": self.error_rate(),
+                "consecutive_failures": self.consecutive_failures
+            }
+
+
+class ModelRouter:
+    """Chooses a model per node call and fails over when the primary is unhealthy."""
+
+    def __init__(self, primary_model: str, fallback_model: str):
+        self.primary_model = primary_model
+        self.fallback_model = fallback_model
+        self._health: Dict[str, ModelHealth] = {}
+        self._lock = threading.Lock()
+
+    def health(self, model: str) -> ModelHealth:
+        with self._lock:
+            if model not in self._health:
+                self._health[model] = ModelHealth(model)
+            return self._health[model]
+
+    def candidates(self, node: str, input_tokens: int) -> List[Tuple[str, str]]:
+        """Return (model, reason) pairs in the order they should be tried."""
+        preferred = self.fallback_model if node in FAST_MODEL_NODES else self.primary_model
+        reason = "node_default"
+        if preferred == self.fallback_model and input_tokens > settings.ROUTER_LARGE_PROMPT_TOKENS:
+            # Long prompts go to the larger model for quality
+            preferred, reason = self.primary_model, "large_prompt"
+
+        alternate = self.fallback_model if preferred == self.primary_model else self.primary_model
+        if self.health(preferred).breaches_slo() and not self.health(alternate).breaches_slo():
+            return [(alternate, "slo_breach"), (preferred, "failover")]
+        return [(preferred, reason), (alternate, "failover")]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            models = list(self._health)
+        return {model: self.health(model).snapshot() for model in models}
+
+
+class RoutedLLM:
+    """Chat model facade that routes each call through the ModelRouter."""
+
+    def __init__(self, router: ModelRouter, llm_service, node: str, temperature: float = 0.2):
+        self.router = router
+        self.llm_service = llm_service
+        self.node = node
+        self.temperature = temperature
+
+    def invoke(self, messages, **kwargs):
+        input_tokens = estimate_tokens(messages)
+        last_error: Optional[Exception] = None
+        previous_model = None
+
+        for model, reason in self.router.candidates(self.node, input_tokens):
+            health = self.router.health(model)
+            if not health.allow_request():
+                continue
+            if previous_model:
+                route_failovers.inc(from_model=previous_model, to_model=model)
+            route_decisions.inc(node=self.node, model=model, reason=reason)
+
+            start = time.perf_counter()
+            try:
+                response = self.llm_service.get_llm(model, temperature=self.temperature).invoke(messages, **kwargs)
+            except Exception as e:
+                health.record(time.perf_counter() - start, ok=False)
+                logger.warning(f"Model {model} failed for node {self.node}: {e}")
+                last_error = e
+                previous_model = model
+                continue
+            health.record(time.perf_counter() - start, ok=True)
+            return response
+
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError(f"No healthy model available for node {self.node}")
+
+
+model_router = ModelRouter(settings.DEFAULT_MODEL, settings.FALLBACK_MODEL)
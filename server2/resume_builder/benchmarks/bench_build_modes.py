@@ -0,0 +1,124 @@
+"""
+Compare latency and output validity of the resume build modes.
+
+Runs each mode against the configured LLM provider, so it needs the same
+environment as the API (e.g. GROQ_API_KEY). Run from server2/resume_builder:
+
+    python -m benchmarks.bench_build_modes --runs 5
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from app.api.routes.resume import get_default_template
+from app.graphs.registry import graph_registry
+from app.services.checkpoints import checkpoint_service
+from app.services.resume import ResumeService
+
+JOB_DESCRIPTION = """
+Senior Software Engineer - Python
+
+We are looking for a Senior Software Engineer with strong Python expertise to join our team.
+The ideal candidate has at least 5 years of experience in Python development, knowledge of web
+frameworks like Django or Flask, and experience with cloud platforms (AWS, GCP, or Azure).
+Familiarity with microservices and container technologies like Docker and Kubernetes is a plus.
+"""
+
+USER_PROFILE = {
+    "name": "John Doe",
+    "email": "john.doe@example.com",
+    "phone": "123-456-7890",
+    "summary": "Software engineer with 7 years of experience developing web applications using Python.",
+    "experience": [
+        {
+            "company": "Tech Solutions Inc.",
+            "position": "Senior Developer",
+            "duration": "2020-Present",
+            "responsibilities": [
+                "Developed and maintained Python microservices",
+                "Led a team of 5 junior developers",
+                "Reduced API response time by 40% through optimization"
+            ]
+        },
+        {
+            "company": "WebDev Co.",
+            "position": "Python Developer",
+            "duration": "2017-2020",
+            "responsibilities": [
+                "Built web applications using Django and Flask",
+                "Optimized database queries"
+            ]
+        }
+    ],
+    "education": [
+        {"degree": "Master of Computer Science", "institution": "University of Technology", "year": "2017"}
+    ],
+    "skills": ["Python", "Django", "Flask", "Docker", "Kubernetes", "AWS", "SQL"],
+    "certifications": ["AWS Certified Developer - Associate"]
+}
+
+
+def is_valid_resume(resume, template):
+    """A resume is valid when every template section is present and non-empty."""
+    return bool(resume) and all(resume.get(key) for key in template)
+
+
+def run_mode(mode, runs):
+    template = get_default_template()
+    variant = ResumeService.select_variant(mode, JOB_DESCRIPTION, USER_PROFILE)
+    latencies, valid = [], 0
+
+    for _ in range(runs):
+        build_id = f"bench-{uuid.uuid4()}"
+        state = {
+            "messages": [],
+            "job_description": JOB_DESCRIPTION,
+            "user_profile": USER_PROFILE,
+            "resume_template": template,
+            "resume_json": {},
+            "error": "",
+            "user_instruction": "",
+            "resume_sections": {},
+            "analysis_cached": False,
+            "raw_output": "",
+            "retry_count": 0
+        }
+        start = time.perf_counter()
+        try:
+            final_state = graph_registry.invoke(variant, state, checkpoint_service.config(build_id))
+            valid += is_valid_resume(final_state.get("resume_json"), template)
+        except Exception as e:
+            print(f"  {mode} run failed: {e}")
+        latencies.append(time.perf_counter() - start)
+        checkpoint_service.delete_build(build_id)
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "variant": variant,
+        "runs": runs,
+        "mean_s": statistics.mean(latencies),
+        "p50_s": latencies[len(latencies) // 2],
+        "max_s": latencies[-1],
+        "valid": f"{valid}/{runs}"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="builds per mode")
+    parser.add_argument("--modes", nargs="+", default=["fast", "thorough", "auto"])
+    args = parser.parse_args()
+
+    graph_registry.compile_all()
+    results = [run_mode(mode, args.runs) for mode in args.modes]
+
+    print(f"{'mode':<10}{'variant':<10}{'runs':>6}{'mean s':>10}{'p50 s':>10}{'max s':>10}{'valid':>8}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['variant']:<10}{r['runs']:>6}{r['mean_s']:>10.2f}"
+              f"{r['p50_s']:>10.2f}{r['max_s']:>10.2f}{r['valid']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare the default FastAPI JSON path with the optimized response path on
+large resume history pages.
+
+"before" validates the page against HistoryPage, runs jsonable_encoder and
+json.dumps, as FastAPI does for a response_model. "after" serializes the page
+with shared.responses.dumps, then gzip or brotli compresses it as
+optimized_response does. Needs no LLM or database. Run from
+server2/resume_builder:
+
+    python -m benchmarks.bench_history_serialization --items 20 100 --runs 50
+"""
+import argparse
+import datetime
+import json
+import time
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+
+# Importing app first puts the repository root, and with it shared, on sys.path
+from app.core.models import HistoryPage
+from shared import responses
+
+
+def make_resume(index: int) -> dict:
+    return {
+        "personal_info": {
+            "name": f"Candidate {index}",
+            "email": f"candidate{index}@example.com",
+            "phone": "123-456-7890",
+            "location": "Berlin, Germany",
+            "summary": "Software engineer with 7 years of experience building Python web services. " * 3
+        },
+        "experience": [
+            {
+                "company": f"Company {job}",
+                "position": "Senior Developer",
+                "startDate": "2019-01",
+                "endDate": "2023-06",
+                "description": "Built and operated Python microservices on Kubernetes. " * 4,
+                "achievements": [f"Cut p95 latency of service {job} by {10 + job}%" for _ in range(4)]
+            }
+            for job in range(5)
+        ],
+        "education": [
+            {"institution": "University of Technology", "degree": "B.Sc.", "field": "Computer Science",
+             "startDate": "2011", "endDate": "2015"}
+        ],
+        "skills": [{"name": f"Skill {skill}", "level": "Expert", "keywords": ["python", "fastapi", "sql"]}
+                   for skill in range(12)],
+        "certifications": [{"name": "AWS Solutions Architect", "date": "2021", "issuer": "Amazon"}]
+    }
+
+
+def make_page(items: int) -> dict:
+    """A full-view history page shaped like MemoryService.list_resumes output."""
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    return {
+        "items": [
+            {
+                "memory_id": str(uuid.uuid4()),
+                "data": {
+                    "job_description": "Senior Software Engineer - Python. " * 40,
+                    "resume": make_resume(index),
+                    "timestamp": now.isoformat()
+                },
+                "created_at": now - datetime.timedelta(hours=index)
+            }
+            for index in range(items)
+        ],
+        "next_cursor": "MTcwMDAwMDAwMC4wfGFiYw"
+    }
+
+
+def before(page: dict) -> bytes:
+    model = HistoryPage.model_validate(page)
+    return json.dumps(jsonable_encoder(model), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def after(page: dict, encoding: str = None) -> bytes:
+    body = responses.dumps(page)
+    responses.make_etag(body)
+    return responses.compress(body, encoding) if encoding else body
+
+
+def measure(function, runs: int) -> float:
+    """Mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[20, 100], help="history page sizes")
+    parser.add_argument("--runs", type=int, default=50, help="serializations per measurement")
+    args = parser.parse_args()
+
+    variants = [("before: jsonable_encoder + json", before), ("after: dumps", after),
+                ("after: dumps + gzip", lambda page: after(page, "gzip"))]
+    if responses.brotli is not None:
+        variants.append(("after: dumps + br", lambda page: after(page, "br")))
+
+    print(f"encoder: {'orjson' if responses.orjson is not None else 'json (orjson not installed)'}")
+    print(f"{'items':>6}  {'path':<34}{'ms/response':>12}{'bytes':>11}{'speedup':>9}")
+    for items in args.items:
+        page = make_page(items)
+        baseline = None
+        for name, function in variants:
+            size = len(function(page))
+            elapsed = measure(lambda: function(page), args.runs)
+            baseline = baseline or elapsed
+            print(f"{items:>6}  {name:<34}{elapsed:>12.2f}{size:>11}{baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,14 @@
+import os
 import uvicorn
+from dotenv import load_dotenv
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=True)
+    # Load .env first so WORKERS and MEMORY_BACKEND set there are checked too
+    load_dotenv()
+    
+    # Memories, checkpoints and caches live in SQLite files under data/, so
+    # any worker can serve any request. Reload only works with one worker.
+    workers = int(os.getenv("WORKERS", "1"))
+    if workers > 1 and os.getenv("MEMORY_BACKEND", "sqlite") != "sqlite":
+        raise SystemExit("MEMORY_BACKEND must be sqlite when running more than one worker")
+    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=workers == 1, workers=workers)
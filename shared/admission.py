@@ -0,0 +1,144 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+from shared.metrics import registry
+
+admission_in_flight = registry.gauge(
+    "admission_in_flight",
+    "Admitted requests currently running, per LLM provider.",
+    ("provider",),
+)
+admission_queue_depth = registry.gauge(
+    "admission_queue_depth",
+    "Requests waiting for an admission slot, per LLM provider.",
+    ("provider",),
+)
+admission_requests = registry.counter(
+    "admission_requests_total",
+    "Admission decisions per provider: admitted, rejected because the queue was full, or timed out in the queue.",
+    ("provider", "outcome"),
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; retry_after is a hint in seconds."""
+
+    def __init__(self, provider: str, reason: str, retry_after: int):
+        super().__init__(f"{provider} is at capacity ({reason}), retry after {retry_after}s")
+        self.provider = provider
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounds concurrent LLM-bound requests for one provider.
+
+    Up to max_concurrency requests run at once and up to max_queue wait for a
+    slot, each for at most queue_timeout seconds. Anything beyond that is
+    rejected immediately so bursts do not pile up on the provider.
+    """
+
+    def __init__(self, provider: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._average_seconds = 5.0
+        admission_in_flight.set_function(lambda: self.in_flight, provider=provider)
+        admission_queue_depth.set_function(lambda: self.waiting, provider=provider)
+
+    def retry_after(self) -> int:
+        """Estimate how long until a slot frees up for a new request."""
+        backlog = self.waiting + 1
+        return max(1, math.ceil(self._average_seconds * backlog / self.max_concurrency))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        admission_requests.inc(provider=self.provider, outcome=reason)
+        return AdmissionRejected(self.provider, reason, self.retry_after())
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold an admission slot for the duration of the block."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if not self._semaphore.locked() and not self.waiting:
+            # A slot is free: acquire() returns without suspending
+            await self._semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            raise self._reject("queue_full")
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject("deadline")
+            finally:
+                self.waiting -= 1
+
+        admission_requests.inc(provider=self.provider, outcome="admitted")
+        self.in_flight += 1
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            # Exponentially weighted service time for Retry-After estimates
+            self._average_seconds = 0.8 * self._average_seconds + 0.2 * (time.monotonic() - start)
+
+
+_controllers: Dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_controller(provider: str) -> AdmissionController:
+    """
+    Return the process-wide controller for a provider.
+
+    Limits come from ADMISSION_<PROVIDER>_MAX_CONCURRENCY, ADMISSION_MAX_QUEUE
+    and ADMISSION_QUEUE_TIMEOUT_SECONDS.
+    """
+    with _controllers_lock:
+        controller = _controllers.get(provider)
+        if controller is None:
+            controller = AdmissionController(
+                provider,
+                max_concurrency=int(os.getenv(f"ADMISSION_{provider.upper()}_MAX_CONCURRENCY", "8")),
+                max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "32")),
+                queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "15"))
+            )
+            _controllers[provider] = controller
+        return controller
+
+
+def require_admission(provider: str = "groq"):
+    """
+    FastAPI dependency that admits the request through the provider's
+    controller, answering 429 with Retry-After when it is at capacity.
+    """
+    controller = get_controller(provider)
+
+    async def dependency():
+        try:
+            async with controller.admit():
+                yield
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
+
+    return dependency
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from shared.metrics import registry
+
+cache_requests = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss).",
+    ("cache", "result"),
+)
+cache_hit_ratio = registry.gauge(
+    "cache_hit_ratio",
+    "Fraction of cache lookups served from the cache since process start.",
+    ("cache",),
+)
+cache_evictions = registry.counter(
+    "cache_evictions_total",
+    "Entries removed from a cache because they expired or exceeded the size bound.",
+    ("cache",),
+)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize free text so trivially different copies hash the same."""
+    return re.sub(r"\s+", " ", (text or "").strip()).lower()
+
+
+def canonical_hash(value: Any) -> str:
+    """Return a stable SHA-256 hex digest of a JSON-serializable value."""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteTTLCache:
+    """
+    Size-bounded TTL cache stored in a SQLite file.
+
+    Every worker process that points at the same file shares the entries.
+    Values must be JSON-serializable. Expired entries are dropped on read and
+    the least recently used entries are evicted once max_entries is exceeded.
+    """
+
+    def __init__(self, path: str, name: str, ttl_seconds: float, max_entries: int):
+        self.path = path
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._hits = 0
+        self._misses = 0
+        self._stats_lock = threading.Lock()
+        cache_hit_ratio.set_function(self.hit_ratio, cache=name)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache_entries (
+                    cache TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (cache, key)
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (cache, accessed_at)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _record(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        cache_requests.inc(cache=self.name, result="hit" if hit else "miss")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE cache = ? AND key = ?",
+            (self.name, key),
+        ).fetchone()
+
+        if row is None or row[1] <= now:
+            if row is not None:
+                conn.execute("DELETE FROM cache_entries WHERE cache = ? AND key = ?", (self.name, key))
+                cache_evictions.inc(cache=self.name)
+            self._record(hit=False)
+            return None
+
+        conn.execute(
+            "UPDATE cache_entries SET accessed_at = ? WHERE cache = ? AND key = ?",
+            (now, self.name, key),
+        )
+        self._record(hit=True)
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store value under key and enforce the TTL and size bounds."""
+        conn = self._connect()
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        conn.execute(
+            """INSERT OR REPLACE INTO cache_entries (cache, key, value, expires_at, accessed_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            (self.name, key, json.dumps(value, default=str), now + ttl, now),
+        )
+        self._evict(conn, now)
+
+    def add(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """
+        Store value under key only if no live entry exists; return whether it was stored.
+
+        The insert is atomic, so exactly one caller, across every worker
+        process sharing the file, can claim a key.
+        """
+        conn = self._connect()
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        conn.execute(
+            "DELETE FROM cache_entries WHERE cache = ? AND key = ? AND expires_at <= ?",
+            (self.name, key, now),
+        )
+        added = conn.execute(
+            """INSERT OR IGNORE INTO cache_entries (cache, key, value, expires_at, accessed_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            (self.name, key, json.dumps(value, default=str), now + ttl, now),
+        ).rowcount == 1
+        if added:
+            self._evict(conn, now)
+        return added
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache_entries WHERE cache = ? AND key = ?", (self.name, key))
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM cache_entries WHERE cache = ?", (self.name,))
+
+    def __len__(self) -> int:
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE cache = ? AND expires_at > ?",
+            (self.name, time.time()),
+        ).fetchone()
+        return row[0]
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        expired = conn.execute(
+            "DELETE FROM cache_entries WHERE cache = ? AND expires_at <= ?", (self.name, now)
+        ).rowcount
+        overflow = conn.execute(
+            """DELETE FROM cache_entries WHERE cache = ? AND key IN (
+                   SELECT key FROM cache_entries WHERE cache = ?
+                   ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+               )""",
+            (self.name, self.name, self.max_entries),
+        ).rowcount
+        if expired + overflow:
+            cache_evictions.inc(expired + overflow, cache=self.name)
+
+    def hit_ratio(self) -> float:
+        with self._stats_lock:
+            total = self._hits + self._misses
+            return self._hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            hits, misses = self._hits, self._misses
+        total = hits + misses
+        return {
+            "cache": self.name,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+            "entries": len(self),
+        }
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict, Field
+
+from shared.llm_scheduler import ScheduledChatModelMixin, estimate_prompt_tokens
+
+# Latency per call: fixed:<s>, uniform:<min>:<max>, normal:<mean>:<stddev>
+# or lognormal:<median>:<sigma>, in seconds
+FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "lognormal:0.8:0.5")
+# Fraction of calls that raise, and of calls that return unparseable output
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+FAKE_LLM_MALFORMED_RATE = float(os.getenv("FAKE_LLM_MALFORMED_RATE", "0"))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "42"))
+# Optional JSON file of [{"match": "<regex>", "response": "<text>"}], checked in order
+FAKE_LLM_RESPONSES = os.getenv("FAKE_LLM_RESPONSES", "")
+
+CLASSIFICATIONS = ("Completely correct", "Partially correct", "Incorrect")
+
+
+class FakeProviderError(RuntimeError):
+    """Injected provider failure."""
+
+
+def parse_latency(spec: str):
+    """Return a function that draws one latency in seconds from a distribution spec."""
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(":") if value]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        # Parameterised by the median so "lognormal:0.8:0.5" centres on 0.8s
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def load_canned_responses(path: str) -> List[Tuple[re.Pattern, str]]:
+    if not path:
+        return []
+    with open(path) as f:
+        return [(re.compile(item["match"], re.DOTALL), item["response"]) for item in json.load(f)]
+
+
+_draw_latency = parse_latency(FAKE_LLM_LATENCY)
+_canned_responses = load_canned_responses(FAKE_LLM_RESPONSES)
+_rng = random.Random(FAKE_LLM_SEED)
+_rng_lock = threading.Lock()
+
+
+def _find_template(text: str) -> Optional[Dict[str, Any]]:
+    """Return the first JSON object in the prompt after the word TEMPLATE."""
+    start = max(text.find("TEMPLATE"), 0)
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\{", text[start:]):
+        try:
+            value, _ = decoder.raw_decode(text, start + match.start())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+def fake_response(text: str, rng: random.Random) -> str:
+    """Build a plausible reply for the prompts used by the interview and resume apps."""
+    for pattern, response in _canned_responses:
+        if pattern.search(text):
+            return response
+
+    if "QQQ" in text:
+        count = re.search(r"generate (\d+) questions", text)
+        count = int(count.group(1)) if count else 5
+        return "QQQ".join(
+            f"Question {index + 1}: Explain a trade-off you made in a recent project and why."
+            for index in range(count)
+        )
+
+    if "Completely correct" in text:
+        count = len(re.findall(r"^Answer \d+:", text, re.MULTILINE)) or 1
+        return "\n".join(f"Answer {index + 1}: {rng.choice(CLASSIFICATIONS)}" for index in range(count))
+
+    if "JSON" in text:
+        template = _find_template(text) or {}
+        section = re.search(r'ONLY the "([^"]+)" section', text)
+        if section and section.group(1) in template:
+            template = {section.group(1): template[section.group(1)]}
+        return "```json\n" + json.dumps(template, indent=2) + "\n```"
+
+    return (
+        "Key requirements: relevant technical skills, several years of hands-on experience, "
+        "clear communication and ownership of delivery."
+    )
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatGroq used for load testing.
+
+    Replies are canned (FAKE_LLM_RESPONSES) or templated from the prompt:
+    QQQ-separated questions, per-answer classifications, or the resume
+    template echoed back as JSON. Latency follows FAKE_LLM_LATENCY, and
+    FAKE_LLM_ERROR_RATE / FAKE_LLM_MALFORMED_RATE inject failures. Draws come
+    from one RNG seeded with FAKE_LLM_SEED, so a sequential run is repeatable.
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    model_name: str = Field(default="fake", alias="model")
+    temperature: float = 0.2
+    max_tokens: Optional[int] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _plan(self, messages: List[BaseMessage]) -> Tuple[float, Optional[str]]:
+        """Draw the latency and either the reply text or None for an injected error."""
+        text = messages[-1].content if messages else ""
+        with _rng_lock:
+            latency = _draw_latency(_rng)
+            roll = _rng.random()
+            reply = fake_response(text if isinstance(text, str) else json.dumps(text), _rng)
+        if roll < FAKE_LLM_ERROR_RATE:
+            return latency, None
+        if roll < FAKE_LLM_ERROR_RATE + FAKE_LLM_MALFORMED_RATE:
+            return latency, reply[: len(reply) // 2]
+        return latency, reply
+
+    def _result(self, messages: List[BaseMessage], reply: Optional[str]) -> ChatResult:
+        if reply is None:
+            raise FakeProviderError(f"Injected failure from fake provider for {self.model_name}")
+        prompt_tokens = estimate_prompt_tokens(messages)
+        completion_tokens = len(reply) // 4 + 1
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=reply))],
+            llm_output={
+                "model_name": self.model_name,
+                "token_usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            }
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        latency, reply = self._plan(messages)
+        time.sleep(latency)
+        return self._result(messages, reply)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        latency, reply = self._plan(messages)
+        await asyncio.sleep(latency)
+        return self._result(messages, reply)
+
+
+class ScheduledFakeChatModel(ScheduledChatModelMixin, FakeChatModel):
+    """Fake model paced by the shared scheduler, so load tests exercise the rate limits too."""
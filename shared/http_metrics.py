@@ -0,0 +1,67 @@
+import time
+
+from shared.metrics import registry
+
+request_latency = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last response byte, per route template.",
+    ("method", "route", "status"),
+)
+
+
+def route_template(scope) -> str:
+    """
+    Return the matched route as a template, e.g. /api/resume/build/{build_id}.
+
+    The trailing segments come from the matched route's own path; included
+    routers may leave their prefix out of it, so the leading segments the
+    route does not cover are copied from the request path. Requests that
+    matched no route return "unmatched".
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    route_segments = (getattr(route, "path_format", None) or route.path).split("/")[1:]
+    path_segments = scope["path"].split("/")
+    # A {name:path} parameter spans as many segments as its value has
+    covered = len(route_segments) + sum(str(value).count("/") for value in (scope.get("path_params") or {}).values())
+    prefix = path_segments[:max(len(path_segments) - covered, 1)]
+    return "/".join(prefix + route_segments)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware that observes request latency per route.
+
+    Routes are labelled by their template (see route_template), so path
+    parameters do not create new series. When apps are nested, only the
+    outermost middleware records the request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("request_metrics"):
+            await self.app(scope, receive, send)
+            return
+
+        scope["request_metrics"] = True
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_latency.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route_template(scope),
+                status=str(status)
+            )
@@ -0,0 +1,89 @@
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+
+from shared.cache import SQLiteTTLCache, canonical_hash
+from shared.metrics import registry
+
+# How long a completed response is replayed for the same key
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# How long an in-flight claim holds a key; bounds the lockout after a worker crash
+IDEMPOTENCY_PENDING_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_TTL_SECONDS", "600"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+IDEMPOTENCY_RETRY_AFTER_SECONDS = 5
+MAX_KEY_LENGTH = 255
+
+idempotency_requests = registry.counter(
+    "idempotency_requests_total",
+    "Requests carrying an Idempotency-Key by endpoint and result: executed, replayed, "
+    "rejected while the first request is in progress, or rejected for a different payload.",
+    ("endpoint", "result"),
+)
+
+
+class IdempotencyStore:
+    """
+    Run an expensive request once per client-chosen Idempotency-Key.
+
+    The first request with a key claims it with a pending entry, runs and
+    stores its JSON response for ttl_seconds; a retry with the same key and
+    payload gets that response back without running again. A retry that
+    arrives while the first request is still running gets 409 with
+    Retry-After, and reusing a key with a different payload gets 422. A
+    failed request releases its key so the client can retry it. Entries
+    live in SQLite, so every worker process sharing the file sees them.
+    """
+
+    def __init__(self, path: str, endpoint: str, ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS,
+                 pending_ttl_seconds: float = IDEMPOTENCY_PENDING_TTL_SECONDS,
+                 max_entries: int = IDEMPOTENCY_MAX_ENTRIES):
+        self.endpoint = endpoint
+        self.ttl_seconds = ttl_seconds
+        self.pending_ttl_seconds = pending_ttl_seconds
+        self._entries = SQLiteTTLCache(path, f"idempotency_{endpoint}", ttl_seconds, max_entries)
+
+    def _reject(self, result: str, status_code: int, detail: str, headers=None) -> HTTPException:
+        idempotency_requests.inc(endpoint=self.endpoint, result=result)
+        return HTTPException(status_code=status_code, detail=detail, headers=headers)
+
+    async def run(self, key: Optional[str], payload: Any, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return compute()'s result, or the stored result of an earlier request with this key.
+
+        payload identifies the request body; it is hashed and compared on
+        replay. Without a key the request simply runs.
+        """
+        if key is None:
+            return await compute()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+
+        fingerprint = canonical_hash(payload)
+        while not self._entries.add(key, {"fingerprint": fingerprint, "state": "pending"}, self.pending_ttl_seconds):
+            entry = self._entries.get(key)
+            if entry is None:
+                # Expired or released between the claim and the read; claim again
+                continue
+            if entry["fingerprint"] != fingerprint:
+                raise self._reject("mismatch", 422, "Idempotency-Key was already used with a different request payload")
+            if entry["state"] == "pending":
+                raise self._reject(
+                    "in_progress",
+                    409,
+                    "A request with this Idempotency-Key is still in progress",
+                    headers={"Retry-After": str(IDEMPOTENCY_RETRY_AFTER_SECONDS)}
+                )
+            idempotency_requests.inc(endpoint=self.endpoint, result="replayed")
+            return entry["response"]
+
+        try:
+            response = await compute()
+        except BaseException:
+            # Failures and cancellations are not stored, so a retry runs again
+            self._entries.delete(key)
+            raise
+
+        self._entries.set(key, {"fingerprint": fingerprint, "state": "done", "response": response}, self.ttl_seconds)
+        idempotency_requests.inc(endpoint=self.endpoint, result="executed")
+        return response
@@ -0,0 +1,70 @@
+"""
+Break down the import cost of a module by top-level package.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+sums the self time of every imported module per top-level package.
+
+Usage:
+    python -m shared.importtime unified_main
+    python -m shared.importtime routers.mock_interview_routes --top 15
+    python -m shared.importtime app.main --path server2/resume_builder
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def measure(module: str, path: str = "") -> Tuple[float, List[Tuple[str, float, int]]]:
+    """Return (total seconds, [(package, self seconds, module count)]) for importing module."""
+    env = dict(os.environ)
+    if path:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [path, env.get("PYTHONPATH", "")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+
+    packages: Dict[str, List[float]] = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = match.groups()
+        package = packages.setdefault(name.split(".")[0], [0.0, 0])
+        package[0] += int(self_us) / 1e6
+        package[1] += 1
+        if name == module:
+            total = int(cumulative_us) / 1e6
+
+    breakdown = sorted(
+        ((name, seconds, count) for name, (seconds, count) in packages.items()),
+        key=lambda item: -item[1]
+    )
+    return total, breakdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import cost per top-level package")
+    parser.add_argument("module", help="Module to import, e.g. unified_main")
+    parser.add_argument("--path", default="", help="Extra directory to put on PYTHONPATH")
+    parser.add_argument("--top", type=int, default=20, help="Number of packages to show")
+    args = parser.parse_args()
+
+    total, breakdown = measure(args.module, args.path)
+    print(f"import {args.module}: {total:.3f}s")
+    print(f"{'package':<32} {'seconds':>9} {'share':>7} {'modules':>8}")
+    for name, seconds, count in breakdown[:args.top]:
+        share = seconds / total if total else 0.0
+        print(f"{name:<32} {seconds:>9.3f} {share:>7.1%} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
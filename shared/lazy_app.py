@@ -0,0 +1,151 @@
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, FastAPI
+from fastapi.concurrency import run_in_threadpool
+
+from shared.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+module_load_seconds = registry.gauge(
+    "app_module_load_seconds",
+    "Time spent importing and initializing each lazily loaded application module.",
+    ("module", "phase"),
+)
+
+
+class LazyApp:
+    """
+    ASGI app that imports its module on the first request it receives.
+
+    The module attribute may be an APIRouter, which is wrapped in its own
+    FastAPI app, or a complete ASGI app. Apps with startup/shutdown handlers
+    get their lifespan driven when they load and when the server stops.
+    """
+
+    def __init__(self, name: str, module: str, attribute: str, sys_path: Optional[str] = None):
+        self.name = name
+        self.module = module
+        self.attribute = attribute
+        self.sys_path = sys_path
+        self.report: Dict[str, Any] = {"name": name, "module": module, "loaded": False}
+        self._app = None
+        self._lock = asyncio.Lock()
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._lifespan_task: Optional[asyncio.Task] = None
+
+    def _import(self) -> Any:
+        if self.sys_path and self.sys_path not in sys.path:
+            sys.path.insert(0, self.sys_path)
+        modules_before = set(sys.modules)
+        start = time.perf_counter()
+        target = getattr(importlib.import_module(self.module), self.attribute)
+        self.report["import_seconds"] = time.perf_counter() - start
+
+        # Group the modules this import pulled in by top-level package
+        packages: Dict[str, int] = {}
+        for name in set(sys.modules) - modules_before:
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0) + 1
+        self.report["new_modules"] = sum(packages.values())
+        self.report["new_packages"] = dict(sorted(packages.items(), key=lambda item: -item[1]))
+        return target
+
+    async def load(self) -> Any:
+        """Import and start the app if that has not happened yet."""
+        if self._app is not None:
+            return self._app
+        async with self._lock:
+            if self._app is None:
+                # Import in a worker thread so the event loop keeps serving other routes
+                target = await run_in_threadpool(self._import)
+                start = time.perf_counter()
+                if isinstance(target, APIRouter):
+                    app = FastAPI()
+                    app.include_router(target)
+                else:
+                    app = target
+                await self._startup(app)
+                self.report["init_seconds"] = time.perf_counter() - start
+                self.report["loaded"] = True
+                module_load_seconds.set(self.report["import_seconds"], module=self.name, phase="import")
+                module_load_seconds.set(self.report["init_seconds"], module=self.name, phase="init")
+                logger.info(
+                    f"Loaded {self.name} ({self.module}) in "
+                    f"{self.report['import_seconds']:.2f}s import + {self.report['init_seconds']:.2f}s init, "
+                    f"{self.report['new_modules']} new modules"
+                )
+                self._app = app
+        return self._app
+
+    async def _startup(self, app: Any) -> None:
+        """Run the app's lifespan startup, if it implements the lifespan protocol."""
+        queue: asyncio.Queue = asyncio.Queue()
+        started = asyncio.get_running_loop().create_future()
+
+        async def receive():
+            return await queue.get()
+
+        async def send(message):
+            if message["type"].startswith("lifespan.startup") and not started.done():
+                started.set_result(message)
+
+        async def run():
+            try:
+                await app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, receive, send)
+            except Exception as e:
+                # Apps without lifespan support raise on the unknown scope type
+                if not started.done():
+                    started.set_exception(e)
+
+        await queue.put({"type": "lifespan.startup"})
+        task = asyncio.create_task(run())
+        try:
+            message = await started
+        except Exception:
+            return
+        if message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(f"Startup of {self.name} failed: {message.get('message', '')}")
+        self._lifespan_queue, self._lifespan_task = queue, task
+
+    async def shutdown(self) -> None:
+        """Run the app's lifespan shutdown if it was started."""
+        if self._lifespan_task is None:
+            return
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        try:
+            await asyncio.wait_for(self._lifespan_task, timeout=10)
+        except Exception as e:
+            logger.warning(f"Shutdown of {self.name} did not complete cleanly: {e}")
+
+    async def __call__(self, scope, receive, send):
+        app = await self.load()
+        await app(scope, receive, send)
+
+
+class PrefixDispatcher:
+    """
+    Top-level ASGI app that sends each path prefix to its own (lazy) app.
+
+    Paths are forwarded unchanged, so mounted routers keep their own
+    prefixes. Anything not matched, including lifespan events, goes to the
+    default app.
+    """
+
+    def __init__(self, default_app: Any, mounts: List[tuple]):
+        self.default_app = default_app
+        self.mounts = mounts
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            for prefix, app in self.mounts:
+                if path == prefix or path.startswith(prefix + "/"):
+                    await app(scope, receive, send)
+                    return
+        await self.default_app(scope, receive, send)
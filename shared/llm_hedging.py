@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatResult
+
+from shared.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+hedge_requests = registry.counter(
+    "llm_hedge_requests_total",
+    "Hedged-model calls by outcome: answered before the hedge delay, hedged and won by the primary, "
+    "won by a hedge, or failed on every candidate.",
+    ("model", "outcome"),
+)
+hedge_rate = registry.gauge(
+    "llm_hedge_rate",
+    "Fraction of calls to a model that fired at least one hedge request.",
+    ("model",),
+)
+hedge_win_ratio = registry.gauge(
+    "llm_hedge_win_ratio",
+    "Fraction of hedged calls to a model that a hedge request won.",
+    ("model",),
+)
+hedge_cancelled = registry.counter(
+    "llm_hedge_cancelled_total",
+    "Candidate calls cancelled because another candidate answered first.",
+    ("model",),
+)
+
+OUTCOMES = ("not_hedged", "primary_won", "hedge_won", "failed")
+
+
+def is_valid_result(result: ChatResult) -> bool:
+    """A response counts as valid when it has non-empty text."""
+    return bool(result.generations) and bool(str(result.generations[0].message.content).strip())
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator else 0.0
+
+
+def hedge_stats(model: str) -> Dict[str, float]:
+    """Return call counts per outcome, the hedge rate and the hedge win ratio for a model."""
+    counts = {outcome: hedge_requests.get(model=model, outcome=outcome) for outcome in OUTCOMES}
+    total = sum(counts.values())
+    hedged = counts["primary_won"] + counts["hedge_won"]
+    return {
+        **counts,
+        "hedge_rate": _ratio(hedged, total),
+        "hedge_win_ratio": _ratio(counts["hedge_won"], hedged)
+    }
+
+
+_tracked_models = set()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _hedge_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop that runs hedged calls for synchronous callers."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-hedge", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def _record(model: str, outcome: str) -> None:
+    hedge_requests.inc(model=model, outcome=outcome)
+    if model not in _tracked_models:
+        _tracked_models.add(model)
+        hedge_rate.set_function(lambda: hedge_stats(model)["hedge_rate"], model=model)
+        hedge_win_ratio.set_function(lambda: hedge_stats(model)["hedge_win_ratio"], model=model)
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Chat model that sends the same call to backup candidates when the primary is slow.
+
+    The primary is called first. Each time hedge_delay seconds pass without
+    a valid response, the next candidate (another model or provider) gets the
+    same call, and a candidate that fails starts the next one immediately.
+    The first valid response wins and the remaining calls are cancelled.
+    Synchronous calls run the same race on a shared background event loop,
+    so their losing calls are cancelled too instead of running to completion.
+    """
+
+    primary: BaseChatModel
+    hedges: List[BaseChatModel]
+    hedge_delay: float
+    validator: Callable[[ChatResult], bool] = is_valid_result
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.primary, "model_name", None) or getattr(self.primary, "model", "unknown")
+
+    def _candidates(self) -> List[BaseChatModel]:
+        return [self.primary, *self.hedges]
+
+    def _finish(self, winner: Optional[int], launched: int) -> None:
+        if winner is None:
+            outcome = "failed"
+        elif launched == 1:
+            outcome = "not_hedged"
+        else:
+            outcome = "primary_won" if winner == 0 else "hedge_won"
+        _record(self.model_name, outcome)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        # The coroutine is scheduled from this thread, so it keeps the caller's
+        # context and tracing spans nest under the caller's span
+        future = asyncio.run_coroutine_threadsafe(self._agenerate(messages, stop, None, **kwargs), _hedge_loop())
+        return future.result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        candidates = self._candidates()
+        tasks: Dict[asyncio.Task, int] = {}
+        errors: List[Exception] = []
+        winner = None
+
+        def launch(index: int) -> None:
+            task = asyncio.ensure_future(candidates[index]._agenerate(messages, stop, None, **kwargs))
+            tasks[task] = index
+
+        launch(0)
+        try:
+            pending = set(tasks)
+            while pending:
+                timeout = self.hedge_delay if len(tasks) < len(candidates) else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and self.validator(task.result()):
+                        winner = tasks[task]
+                        return task.result()
+                    errors.append(task.exception() or ValueError("Invalid response"))
+                if len(tasks) < len(candidates):
+                    # Any valid result returned above, so the delay passed or a call failed:
+                    # hedge with the next candidate
+                    logger.info(f"Hedging {self.model_name} call with candidate {len(tasks)}")
+                    launch(len(tasks))
+                    pending = {task for task in tasks if not task.done()}
+            raise errors[-1]
+        finally:
+            for task, index in tasks.items():
+                if not task.done():
+                    task.cancel()
+                    hedge_cancelled.inc(model=getattr(candidates[index], "model_name", None) or self.model_name)
+            self._finish(winner, len(tasks))
@@ -0,0 +1,58 @@
+import json
+import os
+from typing import Any, Dict
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from shared.llm_scheduler import ScheduledChatGroq
+
+# groq (default), fake (the offline stand-in configured by FAKE_LLM_*
+# variables) or ollama (a local model server)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq").lower()
+
+# Hedging is off unless a delay is set. Targets map a model (or "*") to the
+# "provider:model" candidates tried in order, e.g.
+# LLM_HEDGE_TARGETS='{"llama-3.3-70b-versatile": ["groq:llama-3.1-8b-instant"]}'
+LLM_HEDGE_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "0"))
+LLM_HEDGE_TARGETS: Dict[str, Any] = json.loads(os.getenv("LLM_HEDGE_TARGETS", "{}"))
+
+
+def _model_from_provider(provider: str, kwargs: Dict[str, Any]) -> BaseChatModel:
+    if provider == "fake":
+        # Imported lazily so production processes never load the fake
+        from shared.fake_llm import ScheduledFakeChatModel
+        return ScheduledFakeChatModel(**kwargs)
+    if provider == "groq":
+        return ScheduledChatGroq(**kwargs)
+    if provider == "ollama":
+        from langchain_ollama import ChatOllama
+        return ChatOllama(
+            model=kwargs.get("model") or kwargs.get("model_name"),
+            temperature=kwargs.get("temperature", 0.2),
+            num_predict=kwargs.get("max_tokens")
+        )
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+def create_chat_model(**kwargs) -> BaseChatModel:
+    """
+    Return a chat model from the configured provider.
+
+    Accepts the ChatGroq constructor arguments (model, temperature,
+    max_tokens, ...); providers ignore the ones they do not use. When
+    hedging is configured for the model, the result races the primary
+    against its hedge targets (see HedgedChatModel).
+    """
+    primary = _model_from_provider(LLM_PROVIDER, kwargs)
+    model = kwargs.get("model") or kwargs.get("model_name")
+    targets = LLM_HEDGE_TARGETS.get(model, LLM_HEDGE_TARGETS.get("*", []))
+    if LLM_HEDGE_DELAY_SECONDS <= 0 or not targets:
+        return primary
+
+    from shared.llm_hedging import HedgedChatModel
+    hedges = []
+    for target in [targets] if isinstance(targets, str) else targets:
+        provider, _, hedge_model = target.partition(":")
+        options = {key: value for key, value in kwargs.items() if key != "model_name"}
+        hedges.append(_model_from_provider(provider.lower(), {**options, "model": hedge_model or model}))
+    return HedgedChatModel(primary=primary, hedges=hedges, hedge_delay=LLM_HEDGE_DELAY_SECONDS)
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from langchain_groq import ChatGroq
+
+from shared.metrics import registry
+from shared.tracing import span
+
+logger = logging.getLogger(__name__)
+
+scheduler_waits = registry.counter(
+    "llm_scheduler_delayed_total",
+    "Provider calls that had to wait for requests-per-minute or tokens-per-minute budget.",
+    ("model",),
+)
+scheduler_wait_seconds = registry.counter(
+    "llm_scheduler_wait_seconds_total",
+    "Total time provider calls spent waiting for rate-limit budget.",
+    ("model",),
+)
+scheduler_tokens = registry.counter(
+    "llm_scheduler_tokens_total",
+    "Tokens debited per model: estimated before each call and actual as reported by the provider.",
+    ("model", "kind"),
+)
+scheduler_queue_depth = registry.gauge(
+    "llm_scheduler_queue_depth",
+    "Provider calls currently waiting for rate-limit budget.",
+)
+llm_call_latency = registry.histogram(
+    "llm_call_duration_seconds",
+    "Provider call latency per model, excluding time spent waiting for rate-limit budget.",
+    ("model", "outcome"),
+)
+llm_tokens = registry.counter(
+    "llm_tokens_total",
+    "Prompt and completion tokens reported by the provider, per model.",
+    ("model", "kind"),
+)
+
+# Free-tier quotas; override with LLM_RATE_LIMITS='{"model": {"rpm": 30, "tpm": 6000}}'
+DEFAULT_RATE_LIMITS = {
+    "llama-3.3-70b-versatile": {"rpm": 30, "tpm": 12000},
+    "llama-3.1-8b-instant": {"rpm": 30, "tpm": 6000},
+    "llama3-8b-8192": {"rpm": 30, "tpm": 6000},
+}
+
+# Calls waiting longer than this may no longer be overtaken by smaller calls
+STARVATION_SECONDS = 10.0
+
+
+class RateLimitWaitExceeded(RuntimeError):
+    """Raised when a call could not get rate-limit budget within the maximum wait."""
+
+
+class TokenBucket:
+    """Bucket refilled continuously at capacity per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def seconds_until(self, amount: float) -> float:
+        missing = amount - self.tokens
+        return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+
+class LLMScheduler:
+    """
+    Client-side requests-per-minute and tokens-per-minute budgets per model.
+
+    Each call reserves one request and its estimated tokens (prompt plus
+    max_tokens) before it is sent, waiting until both buckets can cover it.
+    A call that fits may overtake an older, larger call to the same model that
+    does not, unless that call has waited STARVATION_SECONDS; calls to other
+    models are never held back by it. Budgets are per process, so set
+    the limits to the provider quota divided by the number of workers.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, float]], default_rpm: float,
+                 default_tpm: float, max_wait_seconds: float):
+        self.limits = limits
+        self.default_rpm = default_rpm
+        self.default_tpm = default_tpm
+        self.max_wait_seconds = max_wait_seconds
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._waiters: Dict[str, Deque[Tuple[int, float]]] = {}
+        self._next_ticket = 0
+        self._condition = threading.Condition()
+
+    def queue_depth(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def _buckets_for(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        buckets = self._buckets.get(model)
+        if buckets is None:
+            limit = self.limits.get(model, {})
+            buckets = (
+                TokenBucket(limit.get("rpm", self.default_rpm)),
+                TokenBucket(limit.get("tpm", self.default_tpm))
+            )
+            self._buckets[model] = buckets
+        return buckets
+
+    def _may_overtake(self, model: str, ticket: int, now: float) -> bool:
+        oldest_ticket, oldest_since = self._waiters[model][0]
+        return oldest_ticket == ticket or now - oldest_since < STARVATION_SECONDS
+
+    def acquire(self, model: str, tokens: int) -> int:
+        """Block until the model has budget for one call of the given size; return the tokens debited."""
+        start = time.monotonic()
+        deadline = start + self.max_wait_seconds
+        waited = False
+        with self._condition:
+            requests, token_bucket = self._buckets_for(model)
+            # A call larger than the whole bucket could never fit
+            tokens = min(tokens, int(token_bucket.capacity))
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            waiters = self._waiters.setdefault(model, deque())
+            waiters.append((ticket, start))
+            try:
+                while True:
+                    now = time.monotonic()
+                    requests.refill(now)
+                    token_bucket.refill(now)
+                    if requests.tokens >= 1 and token_bucket.tokens >= tokens and self._may_overtake(model, ticket, now):
+                        requests.tokens -= 1
+                        token_bucket.tokens -= tokens
+                        break
+                    if now >= deadline:
+                        raise RateLimitWaitExceeded(
+                            f"No rate-limit budget for {model} within {self.max_wait_seconds:.0f}s"
+                        )
+                    waited = True
+                    delay = max(requests.seconds_until(1), token_bucket.seconds_until(tokens), 0.05)
+                    self._condition.wait(min(delay, deadline - now))
+            finally:
+                waiters.remove((ticket, start))
+                self._condition.notify_all()
+
+        if waited:
+            scheduler_waits.inc(model=model)
+            scheduler_wait_seconds.inc(time.monotonic() - start, model=model)
+        scheduler_tokens.inc(tokens, model=model, kind="estimated")
+        return tokens
+
+    def settle(self, model: str, estimated: int, actual: Optional[int]) -> None:
+        """Correct a reservation with the token count the provider reported."""
+        if actual is None:
+            return
+        scheduler_tokens.inc(actual, model=model, kind="actual")
+        with self._condition:
+            _, token_bucket = self._buckets_for(model)
+            # Refunds unused max_tokens; overruns push the bucket into debt
+            token_bucket.tokens = min(token_bucket.capacity, token_bucket.tokens + estimated - actual)
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._condition:
+            now = time.monotonic()
+            result = {}
+            for model, (requests, token_bucket) in self._buckets.items():
+                requests.refill(now)
+                token_bucket.refill(now)
+                result[model] = {"requests_available": requests.tokens, "tokens_available": token_bucket.tokens}
+            return result
+
+
+def estimate_prompt_tokens(messages: List[BaseMessage]) -> int:
+    """Rough token estimate (about four characters per token plus per-message overhead)."""
+    total = 0
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+        total += len(content) // 4 + 4
+    return total
+
+
+scheduler = LLMScheduler(
+    {**DEFAULT_RATE_LIMITS, **json.loads(os.getenv("LLM_RATE_LIMITS", "{}"))},
+    default_rpm=float(os.getenv("LLM_DEFAULT_RPM", "30")),
+    default_tpm=float(os.getenv("LLM_DEFAULT_TPM", "6000")),
+    max_wait_seconds=float(os.getenv("LLM_SCHEDULER_MAX_WAIT_SECONDS", "120"))
+)
+scheduler_queue_depth.set_function(scheduler.queue_depth)
+DEFAULT_COMPLETION_TOKENS = int(os.getenv("LLM_DEFAULT_COMPLETION_TOKENS", "1024"))
+
+
+def _reported_tokens(result: ChatResult) -> Optional[int]:
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    return usage.get("total_tokens")
+
+
+def _record_call(model: str, start: float, result: Optional[ChatResult], call_span) -> None:
+    """Record call latency and the provider's prompt/completion token counts."""
+    llm_call_latency.observe(time.perf_counter() - start, model=model, outcome="ok" if result else "error")
+    if result is None:
+        return
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    for kind in ("prompt", "completion"):
+        if usage.get(f"{kind}_tokens") is not None:
+            llm_tokens.inc(usage[f"{kind}_tokens"], model=model, kind=kind)
+            if call_span:
+                call_span.set(**{f"{kind}_tokens": usage[f"{kind}_tokens"]})
+
+
+class ScheduledChatModelMixin:
+    """Chat model mixin that waits for the shared scheduler's per-model budget before each call."""
+
+    def _estimate(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> int:
+        max_tokens = kwargs.get("max_tokens") or self.max_tokens or DEFAULT_COMPLETION_TOKENS
+        return estimate_prompt_tokens(messages) + max_tokens
+
+    def _settle(self, estimated: int, result: Optional[ChatResult]) -> None:
+        # A failed call is refunded its whole reservation
+        scheduler.settle(self.model_name, estimated, _reported_tokens(result) if result else 0)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        with span("llm.call", model=self.model_name) as call_span:
+            with span("llm.rate_limit_wait"):
+                estimated = scheduler.acquire(self.model_name, self._estimate(messages, kwargs))
+            start, result = time.perf_counter(), None
+            try:
+                result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            finally:
+                _record_call(self.model_name, start, result, call_span)
+                self._settle(estimated, result)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        with span("llm.call", model=self.model_name) as call_span:
+            with span("llm.rate_limit_wait"):
+                acquire = asyncio.ensure_future(
+                    asyncio.to_thread(scheduler.acquire, self.model_name, self._estimate(messages, kwargs))
+                )
+                try:
+                    estimated = await asyncio.shield(acquire)
+                except asyncio.CancelledError:
+                    # The waiting thread cannot be stopped; refund its reservation once it is granted
+                    acquire.add_done_callback(
+                        lambda done: done.cancelled() or done.exception() or self._settle(done.result(), None)
+                    )
+                    raise
+            start, result = time.perf_counter(), None
+            try:
+                result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            finally:
+                _record_call(self.model_name, start, result, call_span)
+                self._settle(estimated, result)
+        return result
+
+
+class ScheduledChatGroq(ScheduledChatModelMixin, ChatGroq):
+    """ChatGroq that waits for the shared scheduler's per-model budget before each call."""
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+# Fast settings: large JSON compresses well even at low levels
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to compact JSON bytes.
+
+    Uses orjson when it is installed, which handles dicts, lists, datetimes
+    and UUIDs natively and is several times faster than jsonable_encoder
+    followed by json.dumps. UTC datetimes end in "Z", as Pydantic writes them.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, or None for identity."""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip()] = quality
+
+    def accepted(encoding: str) -> float:
+        return offered.get(encoding, offered.get("*", 0.0))
+
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best = max(candidates, key=accepted)
+    return best if accepted(best) > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+
+
+def make_etag(body: bytes) -> str:
+    # Weak, because the same entity is sent with different content encodings
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def optimized_response(request: Request, content: Any, status_code: int = 200,
+                       headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Build a JSON response for large payloads such as resumes and history pages.
+
+    The body is serialized with dumps and tagged with an ETag; a GET whose
+    If-None-Match matches gets an empty 304. Bodies of at least
+    RESPONSE_COMPRESSION_MIN_BYTES are compressed with brotli (when the
+    brotli package is installed) or gzip, whichever the client prefers.
+    """
+    body = dumps(content)
+    etag = make_etag(body)
+    response_headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        # Clients may keep the response but must revalidate it before reuse
+        "Cache-Control": "private, no-cache",
+        **(headers or {})
+    }
+
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=response_headers)
+
+    if len(body) >= RESPONSE_COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        if encoding:
+            body = compress(body, encoding)
+            response_headers["Content-Encoding"] = encoding
+
+    return Response(body, status_code=status_code, headers=response_headers, media_type="application/json")
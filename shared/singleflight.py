@@ -0,0 +1,54 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from shared.metrics import registry
+
+T = TypeVar("T")
+
+singleflight_requests = registry.counter(
+    "singleflight_requests_total",
+    "Calls through a singleflight group; coalesced calls shared another call's result.",
+    ("group", "role"),
+)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key onto one in-flight computation.
+
+    The first caller for a key runs the computation; callers arriving while it
+    is still running await the same future and receive its result (or error).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is not None:
+            singleflight_requests.inc(group=self.name, role="coalesced")
+            # Shield so a cancelled follower does not cancel the shared computation
+            return await asyncio.shield(future)
+
+        singleflight_requests.inc(group=self.name, role="leader")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
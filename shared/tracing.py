@@ -0,0 +1,228 @@
+"""
+Lightweight local tracing: nested spans per request, graph node, LLM call
+and CPU stage, appended as JSON lines to a rotating file (TRACE_FILE).
+
+Usage:
+    python -m shared.tracing                      # critical path of the latest request
+    python -m shared.tracing <trace_id>
+    python -m shared.tracing --file server2/resume_builder/data/traces.jsonl
+"""
+import argparse
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Iterator, List, Optional
+
+from shared.http_metrics import route_template
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+TRACE_FILE = os.getenv("TRACE_FILE", "data/traces.jsonl")
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_BACKUP_COUNT = int(os.getenv("TRACE_BACKUP_COUNT", "5"))
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+_writer: Optional[logging.Logger] = None
+_writer_lock = threading.Lock()
+
+
+def _span_writer() -> logging.Logger:
+    """Return the logger that appends finished spans to the rotating trace file."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                directory = os.path.dirname(TRACE_FILE)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                handler = RotatingFileHandler(TRACE_FILE, maxBytes=TRACE_MAX_BYTES, backupCount=TRACE_BACKUP_COUNT)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                writer = logging.getLogger("shared.tracing.spans")
+                writer.setLevel(logging.INFO)
+                writer.propagate = False
+                writer.addHandler(handler)
+                _writer = writer
+    return _writer
+
+
+class Span:
+    """One timed operation in a trace; attributes can be added while it runs."""
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.status = "ok"
+        self.start = time.time()
+        self._start = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self, duration: float) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration": duration,
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Record the block as a span nested under the current span.
+
+    The current span follows contextvars, so it carries over into asyncio
+    tasks and run_in_threadpool calls. Yields None when tracing is disabled.
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        duration = time.perf_counter() - current._start
+        try:
+            _span_writer().info(json.dumps(current.to_dict(duration), default=str))
+        except Exception:
+            # Tracing must never fail the traced operation
+            pass
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that opens the root span of every HTTP request.
+
+    The span is named after the matched route template and its trace ID is
+    returned in the X-Trace-Id response header. When apps are nested, only
+    the outermost middleware opens a span.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not TRACING_ENABLED or scope["type"] != "http" or scope.get("tracing"):
+            await self.app(scope, receive, send)
+            return
+
+        scope["tracing"] = True
+        with span("http.request", method=scope["method"], path=scope["path"]) as request_span:
+            async def send_with_trace_id(message):
+                if message["type"] == "http.response.start":
+                    request_span.set(status=message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-trace-id", request_span.trace_id.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                request_span.name = f"{scope['method']} {route_template(scope)}"
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Read spans from a trace file and its rotated backups."""
+    spans = []
+    paths = [f"{path}.{index}" for index in range(TRACE_BACKUP_COUNT, 0, -1)] + [path]
+    for file_path in paths:
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path) as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return spans
+
+
+def critical_path(spans: List[Dict[str, Any]], root: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return the spans on the critical path below root, in start order.
+
+    Walking back from the end of a span, the child that finished last is the
+    one the span was waiting on; the walk continues from that child's start.
+    Time on the path not covered by a child is the span's own (self) time.
+    """
+    children = defaultdict(list)
+    for item in spans:
+        children[item["parent_id"]].append(item)
+
+    path = []
+
+    def visit(node: Dict[str, Any]) -> None:
+        cursor = node["start"] + node["duration"]
+        chain = []
+        for child in sorted(children[node["span_id"]], key=lambda c: c["start"] + c["duration"], reverse=True):
+            child_end = child["start"] + child["duration"]
+            if child_end <= cursor + 1e-6:
+                chain.append(child)
+                cursor = child["start"]
+        covered = sum(child["duration"] for child in chain)
+        path.append({**node, "self": max(0.0, node["duration"] - covered)})
+        for child in reversed(chain):
+            visit(child)
+
+    visit(root)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print the critical path of a trace.")
+    parser.add_argument("trace_id", nargs="?", help="trace to show (default: the most recent request)")
+    parser.add_argument("--file", default=TRACE_FILE, help="trace file written by the apps")
+    args = parser.parse_args()
+
+    spans = load_spans(args.file)
+    roots = [item for item in spans if item["parent_id"] is None and (not args.trace_id or item["trace_id"] == args.trace_id)]
+    if not roots:
+        raise SystemExit(f"No matching trace found in {args.file}")
+    root = max(roots, key=lambda item: item["start"])
+    trace = [item for item in spans if item["trace_id"] == root["trace_id"]]
+
+    depth = {root["span_id"]: 0}
+    by_id = {item["span_id"]: item for item in trace}
+    print(f"Trace {root['trace_id']}: {root['name']} took {root['duration']:.3f}s ({len(trace)} spans)")
+    print(f"{'self':>9} {'total':>9} {'share':>6}  span")
+    for item in critical_path(trace, root):
+        parent = by_id.get(item["parent_id"])
+        depth[item["span_id"]] = depth[parent["span_id"]] + 1 if parent else 0
+        attributes = " ".join(f"{key}={value}" for key, value in item["attributes"].items() if key != "error")
+        share = item["self"] / root["duration"] * 100 if root["duration"] else 0.0
+        print(
+            f"{item['self']:>8.3f}s {item['duration']:>8.3f}s {share:>5.1f}%  "
+            f"{'  ' * depth[item['span_id']]}{item['name']}"
+            f"{' [' + item['status'] + ']' if item['status'] != 'ok' else ''} {attributes}".rstrip()
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import os
+import time
+
+_START = time.perf_counter()
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from shared.http_metrics import RequestMetricsMiddleware
+from shared.lazy_app import LazyApp, PrefixDispatcher, module_load_seconds
+from shared.metrics import registry, PROMETHEUS_CONTENT_TYPE
+from shared.tracing import TracingMiddleware
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+RESUME_BUILDER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server2", "resume_builder")
+
+# Each router group is imported on its first request, so the process starts
+# without loading PyMuPDF, LangChain, LangGraph or LangServe
+lazy_apps = {
+    "candidates": LazyApp("candidates", "routers.mock_interview_routes", "router"),
+    "resume": LazyApp("resume", "routers.resume_routers", "router"),
+    "resume_builder": LazyApp("resume_builder", "app.main", "app", sys_path=RESUME_BUILDER_DIR),
+}
+
+# Create the FastAPI app
+core = FastAPI(
+    title="Garuda API",
+    description="Mock interview, resume and resume builder APIs in one process",
+    version="1.0.0"
+)
+
+@core.on_event("startup")
+async def warm_up():
+    # Optionally load router groups in the background once the server is up,
+    # e.g. WARMUP_ROUTERS=all or WARMUP_ROUTERS=candidates,resume
+    names = os.getenv("WARMUP_ROUTERS", "")
+    selected = list(lazy_apps) if names == "all" else [name for name in names.split(",") if name in lazy_apps]
+    for name in selected:
+        asyncio.create_task(lazy_apps[name].load())
+
+@core.on_event("shutdown")
+async def shut_down():
+    for lazy_app in lazy_apps.values():
+        await lazy_app.shutdown()
+
+@core.get("/", response_description="API Status")
+async def root():
+    return {"status": "online", "message": "Garuda API is running"}
+
+@core.get("/startup")
+async def startup_report():
+    """Report how long the process took to start and each router group took to load."""
+    return {
+        "app_init_seconds": module_load_seconds.get(module="app", phase="init"),
+        "modules": [lazy_app.report for lazy_app in lazy_apps.values()]
+    }
+
+@core.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Expose process metrics in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+# Request latency and traces are recorded around the dispatcher so every router group is covered
+app = RequestMetricsMiddleware(TracingMiddleware(PrefixDispatcher(core, [
+    ("/candidates", lazy_apps["candidates"]),
+    ("/resume", lazy_apps["resume"]),
+    ("/api", lazy_apps["resume_builder"]),
+])))
+
+module_load_seconds.set(time.perf_counter() - _START, module="app", phase="init")
+
+# Run the application if executed directly
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("unified_main:app", host="0.0.0.0", port=8000)